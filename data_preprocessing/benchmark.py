@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the extraction pipeline over a reproducible synthetic corpus.
+
+The corpus generator produces documents shaped like our cleaned_data files
+(HN threads, LinkedIn pages, GitHub issues), flattened to one line the way
+clean.js writes them.  Each stage is timed separately at 1x/10x/100x scale:
+
+    ner        nlp.pipe over the corpus (skipped if the model isn't installed)
+    regex      URL + email extraction
+    phones     phone extraction, starting from a cold parse cache
+    validate   validate_batch over the generated PERSON/ORG candidates
+    snippets   context_snippet for every contact mention
+    csv        writing the resulting records with csv.DictWriter
+
+Usage:
+    python benchmark.py [--scales 1 10 100] [--docs 20] [--seed 0]
+                        [--stages ner regex ...] [--model sm|md|lg] [--repeat 3]
+                        [--output bench.json] [--compare previous.json]
+    python benchmark.py generate OUT_DIR [--docs N] [--seed 0]
+
+Results (docs/sec, MB/sec, peak RSS) are written as JSON so runs can be
+compared for regressions with --compare.  Peak RSS is the process high-water
+mark after the stage, so it only grows across stages.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import time
+from collections import namedtuple
+
+from extractor import DEFAULT_MODEL, context_snippet, load_model
+from extractor.core import EMAIL_RE, URL_RE, clean_url, contact_mentions
+from extractor.phones import find_phone_numbers, parse_candidate
+from extractor.validators import validate_batch
+
+STAGES = ("ner", "regex", "phones", "validate", "snippets", "csv")
+
+FIRST = ["James", "Priya", "Wei", "Maria", "Ahmed", "Olivia", "Lukas", "Sofia", "Arjun", "Emma",
+         "Diego", "Hana", "Noah", "Fatima", "Ivan", "Chloe", "Kenji", "Amara", "Liam", "Zara"]
+LAST = ["Smith", "Sharma", "Chen", "Garcia", "Khan", "Brown", "Müller", "Rossi", "Patel", "Nguyen",
+        "Silva", "Tanaka", "Johnson", "Okafor", "Petrov", "Martin", "Kim", "Haddad", "Walsh", "Costa"]
+COMPANIES = ["Doppler", "Acme Analytics", "Brightline Labs", "Northwind Systems", "Quantive",
+             "Helio Health", "Stackwise", "Orbital Security", "Papertrail", "Lumen Data Inc",
+             "Fernweh Travel", "Cobalt Robotics", "Greenfield Capital", "Tessellate AI", "Kitewave"]
+TITLES = ["CEO", "CTO", "Founder", "Co-founder", "VP Engineering", "Head of Growth",
+          "Director of Sales", "Product Manager", "Senior Engineer"]
+NOISE = ["Click here", "Learn more", "API", "SaaS", "Machine Learning", "Web Development",
+         "Sales Team", "LinkedIn", "Contact us", "Privacy Policy"]
+WORDS = ("the we our team is building a platform for data teams that need fast reliable "
+         "pipelines and we are hiring engineers who care about performance and developer "
+         "experience this release adds support for streaming exports and fixes several bugs").split()
+
+Span = namedtuple("Span", "label_ text")
+
+
+def _sentence(rng: random.Random, n: int = 12) -> str:
+    words = rng.choices(WORDS, k=n)
+    return " ".join(words).capitalize() + "."
+
+
+def _person(rng):
+    return f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+
+
+def _domain(company):
+    return company.lower().replace(" inc", "").replace(" ", "") + ".com"
+
+
+def _phone(rng):
+    return rng.choice([
+        f"+1 {rng.randint(201, 989)}-555-{rng.randint(1000, 9999)}",
+        f"({rng.randint(201, 989)}) 555-{rng.randint(1000, 9999)}",
+        f"+91 9{rng.randint(100000000, 999999999)}",
+        f"+44 20 7946 {rng.randint(1000, 9999)}",
+    ])
+
+
+def hn_thread(rng):
+    parts = [f"{_sentence(rng, 8)} | Hacker News {rng.randint(50, 900)} points by "
+             f"{rng.choice(FIRST).lower()}{rng.randint(1, 99)} {rng.randint(1, 23)} hours ago"]
+    for _ in range(rng.randint(15, 60)):
+        user = f"{rng.choice(LAST).lower()}_{rng.randint(1, 999)}"
+        body = _sentence(rng, rng.randint(8, 40))
+        if rng.random() < 0.3:
+            company = rng.choice(COMPANIES)
+            body += f" I worked with {_person(rng)} at {company}, see https://{_domain(company)}/blog/{rng.randint(1, 999)}."
+        if rng.random() < 0.05:
+            body += f" Reach me at {user}@{rng.choice(['gmail.com', 'proton.me', 'fastmail.com'])}."
+        parts.append(f"{user} {rng.randint(1, 12)} hours ago | parent | next [–] {body} reply")
+    return " ".join(parts)
+
+
+def linkedin_page(rng):
+    name, company = _person(rng), rng.choice(COMPANIES)
+    parts = [f"{name} {rng.choice(TITLES)} at {company} {rng.choice(['San Francisco', 'Bengaluru', 'London', 'Berlin'])}",
+             f"{rng.randint(200, 30000)} followers 500+ connections Contact info",
+             f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}-{rng.randint(100, 999)}",
+             f"About {_sentence(rng, 30)}", "Experience"]
+    for _ in range(rng.randint(2, 6)):
+        parts.append(f"{rng.choice(TITLES)} {rng.choice(COMPANIES)} {rng.randint(2010, 2024)} - Present "
+                     f"{_sentence(rng, 20)}")
+    parts.append(f"Email {name.split()[0].lower()}@{_domain(company)} Phone {_phone(rng)}")
+    parts.append(" ".join(rng.choices(NOISE, k=6)))
+    return " ".join(parts)
+
+
+def github_issue(rng):
+    repo = f"{rng.choice(LAST).lower()}/{rng.choice(WORDS)}-{rng.choice(WORDS)}"
+    parts = [f"{_sentence(rng, 6)} #{rng.randint(1, 9000)} Open {rng.choice(LAST).lower()} opened this issue "
+             f"{rng.randint(1, 30)} days ago https://github.com/{repo}/issues/{rng.randint(1, 9000)}"]
+    for _ in range(rng.randint(5, 30)):
+        parts.append(f"{rng.choice(FIRST).lower()}{rng.randint(1, 99)} commented {_sentence(rng, rng.randint(10, 50))}")
+        if rng.random() < 0.3:
+            parts.append(f"fixed in {rng.getrandbits(40):010x} see https://github.com/{repo}/pull/{rng.randint(1, 9000)}")
+        if rng.random() < 0.1:
+            parts.append(f"cc {_person(rng)} from {rng.choice(COMPANIES)} (maintainer)")
+    return " ".join(parts)
+
+
+SHAPES = [("hn", hn_thread), ("linkedin", linkedin_page), ("github", github_issue)]
+
+
+def generate_corpus(n_docs: int, seed: int = 0) -> list[tuple[str, str]]:
+    """Deterministic list of (text, filename) pairs cycling through the page shapes."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n_docs):
+        shape, make = SHAPES[i % len(SHAPES)]
+        corpus.append((make(rng), f"cleaned_synthetic_{shape}_{i:05d}.txt"))
+    return corpus
+
+
+def candidate_spans(text: str) -> list[Span]:
+    """PERSON/ORG-labelled candidates like the ones NER hands to the validators."""
+    spans = []
+    for name in COMPANIES + NOISE:
+        if name in text:
+            spans.append(Span("ORG", name))
+    for first in FIRST:
+        if first in text:
+            spans.append(Span("PERSON", first))
+    for noise in NOISE:
+        if noise in text:
+            spans.append(Span("PERSON", noise))
+    return spans
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+
+def time_stage(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def run_stage(stage: str, corpus, model: str) -> float | None:
+    texts = [text for text, _ in corpus]
+
+    if stage == "ner":
+        try:
+            nlp = load_model(model)
+        except (ImportError, OSError) as e:
+            print(f"   skipping ner: {e}")
+            return None
+        return time_stage(lambda: list(nlp.pipe(texts, batch_size=16)))
+
+    if stage == "regex":
+        def regex():
+            for text in texts:
+                [clean_url(m.group()) for m in URL_RE.finditer(text)]
+                EMAIL_RE.findall(text)
+        return time_stage(regex)
+
+    if stage == "phones":
+        parse_candidate.cache_clear()
+        return time_stage(lambda: [find_phone_numbers(text) for text in texts])
+
+    if stage == "validate":
+        spans = [candidate_spans(text) for text in texts]
+        return time_stage(lambda: [validate_batch(s) for s in spans])
+
+    if stage == "snippets":
+        mentions = [contact_mentions(text) for text in texts]
+        def snippets():
+            for text, ms in zip(texts, mentions):
+                for _, _, start, end in ms:
+                    context_snippet(text, start, end)
+        return time_stage(snippets)
+
+    if stage == "csv":
+        records = []
+        for text, name in corpus:
+            records += [{"file": name, "type": k, "entity": e, "snippet": context_snippet(text, s, t)}
+                        for k, e, s, t in contact_mentions(text)]
+        def write():
+            buf = io.StringIO()
+            writer = csv.DictWriter(buf, fieldnames=["file", "type", "entity", "snippet"])
+            writer.writeheader()
+            writer.writerows(records)
+        return time_stage(write)
+
+    raise ValueError(f"Unknown stage {stage!r}")
+
+
+def run_benchmarks(scales, n_docs: int, seed: int, stages, model: str, repeat: int = 3) -> dict:
+    results = []
+    for scale in scales:
+        corpus = generate_corpus(n_docs * scale, seed)
+        n_bytes = sum(len(text.encode("utf8")) for text, _ in corpus)
+        print(f"Scale {scale}x: {len(corpus)} docs, {n_bytes / 1e6:.2f} MB")
+        for stage in stages:
+            # Best of `repeat` runs to damp scheduler noise on short stages
+            timings = [run_stage(stage, corpus, model) for _ in range(repeat)]
+            if None in timings:
+                continue
+            seconds = min(timings)
+            row = {
+                "scale": scale,
+                "stage": stage,
+                "docs": len(corpus),
+                "bytes": n_bytes,
+                "seconds": round(seconds, 6),
+                "docs_per_sec": round(len(corpus) / seconds, 2) if seconds else None,
+                "mb_per_sec": round(n_bytes / 1e6 / seconds, 3) if seconds else None,
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+            }
+            results.append(row)
+            print(f"   - {stage:9}: {row['seconds']:.4f}s  {row['docs_per_sec']} docs/s  "
+                  f"{row['mb_per_sec']} MB/s  peak RSS {row['peak_rss_mb']} MB")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model": model,
+            "seed": seed,
+            "docs_per_scale": n_docs,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, previous: dict, tolerance: float = 0.2):
+    before = {(r["scale"], r["stage"]): r for r in previous["results"]}
+    print("\nComparison with previous run (docs/sec, >1.0 is faster):")
+    for r in current["results"]:
+        old = before.get((r["scale"], r["stage"]))
+        if old and old.get("docs_per_sec") and r.get("docs_per_sec"):
+            ratio = r["docs_per_sec"] / old["docs_per_sec"]
+            flag = "  <-- regression" if ratio < 1 - tolerance else ""
+            print(f"   - {r['scale']:>4}x {r['stage']:9}: {ratio:.2f}x{flag}")
+
+
+def write_corpus(out_dir: str, n_docs: int, seed: int):
+    os.makedirs(out_dir, exist_ok=True)
+    for text, name in generate_corpus(n_docs, seed):
+        with open(os.path.join(out_dir, name), "w", encoding="utf8") as fh:
+            fh.write(text)
+    print(f"Wrote {n_docs} synthetic documents to {out_dir}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "generate":
+        g = argparse.ArgumentParser(description="Write the synthetic corpus as .txt files")
+        g.add_argument("out_dir")
+        g.add_argument("--docs", type=int, default=60)
+        g.add_argument("--seed", type=int, default=0)
+        gargs = g.parse_args(sys.argv[2:])
+        write_corpus(gargs.out_dir, gargs.docs, gargs.seed)
+        sys.exit(0)
+
+    p = argparse.ArgumentParser(description="Benchmark the extraction pipeline stages")
+    p.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    p.add_argument("--docs", type=int, default=20, help="Documents at 1x scale")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    p.add_argument("--model", default=DEFAULT_MODEL, help="spaCy model for the ner stage")
+    p.add_argument("--repeat", type=int, default=3, help="Runs per stage; the fastest is reported")
+    p.add_argument("--output", default="bench_results.json", help="Where to write the JSON results")
+    p.add_argument("--compare", help="Previous results JSON to compare against")
+    p.add_argument("--tolerance", type=float, default=0.2,
+                   help="Slowdown fraction flagged as a regression by --compare")
+    args = p.parse_args()
+
+    # Read the baseline before anything is written: --output may be the same file
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf8") as fh:
+            previous = json.load(fh)
+
+    report = run_benchmarks(args.scales, args.docs, args.seed, args.stages, args.model, args.repeat)
+    with open(args.output, "w", encoding="utf8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if previous is not None:
+        compare(report, previous, args.tolerance)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Make `extractor` importable however pytest is invoked (repo root, this
+# directory, plain `pytest` or `python -m pytest`)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Distil the extractor's NER into a small, CPU-fast spaCy model.
+
+en_core_web_lg is far more model than our narrow domain (people and
+companies on tech/business pages) needs.  This trains a compact tok2vec +
+ner pipeline (hash embeddings, no static vectors) on silver labels: the
+PERSON/ORG mentions the current extractor reports after its validators and
+gazetteer have run.
+
+    label     write silver annotations as DATA/train.spacy and DATA/dev.spacy,
+              either by running the extractor's model over INPUT_DIR or, with
+              --labels, from an existing leads_with_context.csv (every
+              whole-word occurrence of a file's people and organizations).
+              Files are split by a hash of their name, so the held-out set
+              is the same on every run.
+    train     train on the silver data with spaCy's trainer and install the
+              best model at models/leads_ner
+    evaluate  score models on the held-out set through the same load_model()
+              and entity_mentions() path the extractor uses: mention- and
+              entity-level precision/recall/F1, docs/sec and load time
+
+Usage:
+    python distill.py label [INPUT_DIR] [--labels CSV] [--model lg] [--stoplist FILE]
+                            [--input-format txt|leads|raw] [--dev-percent 20]
+                            [--max-chars N] [--data DIR]
+    python distill.py train [--data DIR] [--output DIR] [--max-steps N] [--width N]
+    python distill.py evaluate [--data DIR] [--gold FILE] [--models lg distilled ...]
+                               [--stoplist FILE] [--output distill_eval.json]
+
+Then extract with `python test.py INPUT_DIR --model distilled`.
+
+The held-out labels come from the baseline itself, so lg scores close to
+1.0 there by construction and the distilled model's figures measure how
+faithfully it reproduces lg.  Pass --gold with a hand-labelled DocBin for
+absolute numbers.
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+import sys
+import time
+import zlib
+from collections import Counter, defaultdict
+
+from extractor import DEFAULT_CHUNK_SIZE, DEFAULT_MODEL, LOAD_TIMES, load_model, model_name
+from extractor.core import entity_mentions
+from extractor.index import normalize_entity
+from extractor.model import DISTILLED_MODEL
+from extractor.sources import INPUT_FORMATS, list_documents, read_document
+from extractor.validators import DEFAULT_STOPLISTS, load_stoplists
+
+try:
+    import spacy
+    from spacy.tokens import DocBin
+    from spacy.util import filter_spans
+except ImportError:
+    sys.exit("Please install spaCy: pip install spacy")
+
+LABELS = {"person": "PERSON", "organization": "ORG"}
+TYPES = {label: kind for kind, label in LABELS.items()}
+DATA_DIR = "distill_data"
+
+# -------------------------------------------------------------------
+# Silver labels
+# -------------------------------------------------------------------
+
+def is_dev(filename: str, dev_percent: int) -> bool:
+    """Stable held-out split, independent of file order and corpus size."""
+    return zlib.crc32(filename.encode("utf8")) % 100 < dev_percent
+
+def csv_labels(path: str) -> dict[str, set[tuple[str, str]]]:
+    """{file: {(label, entity), ...}} for the PERSON/ORG rows of a leads CSV."""
+    labels = defaultdict(set)
+    with open(path, newline="", encoding="utf8") as fh:
+        for row in csv.DictReader(fh):
+            if row["type"] in LABELS:
+                labels[row["file"]].add((LABELS[row["type"]], row["entity"]))
+    return labels
+
+def find_spans(text: str, entities) -> list[tuple[int, int, str]]:
+    """Whole-word occurrences of the labelled strings, longest first, without overlaps."""
+    taken = bytearray(len(text))
+    spans = []
+    for label, entity in sorted(entities, key=lambda e: -len(e[1])):
+        for m in re.finditer(r'(?<!\w)' + re.escape(entity) + r'(?!\w)', text):
+            if not any(taken[m.start():m.end()]):
+                taken[m.start():m.end()] = b"\x01" * (m.end() - m.start())
+                spans.append((m.start(), m.end(), label))
+    return sorted(spans)
+
+def model_spans(nlp, texts, stoplists, batch_size: int):
+    """Validated PERSON/ORG spans per text, as the extractor would report them."""
+    for doc in nlp.pipe(texts, batch_size=batch_size):
+        yield [(start, end, LABELS[kind]) for kind, _, start, end in entity_mentions(doc, stoplists)]
+
+def to_doc(make_doc, text: str, spans):
+    doc = make_doc(text)
+    ents = [doc.char_span(start, end, label=label, alignment_mode="contract") for start, end, label in spans]
+    doc.ents = filter_spans([span for span in ents if span is not None])
+    return doc
+
+def label(input_dir: str, data_dir: str = DATA_DIR, labels_csv: str | None = None,
+          model: str = DEFAULT_MODEL, stoplist_path: str | None = None, input_format: str = "txt",
+          dev_percent: int = 20, max_chars: int = DEFAULT_CHUNK_SIZE, batch_size: int = 16):
+    docs, too_long = [], 0
+    for path in list_documents(input_dir, input_format):
+        text, _ = read_document(path, input_format)
+        if len(text) > max_chars:
+            too_long += 1
+            continue
+        docs.append((os.path.basename(path), text))
+    if not docs:
+        sys.exit(f"No {input_format} input files found in '{input_dir}'.")
+
+    stoplists = load_stoplists(stoplist_path) if stoplist_path else DEFAULT_STOPLISTS
+    if labels_csv:
+        by_file = csv_labels(labels_csv)
+        spans = (find_spans(text, by_file.get(name, ())) for name, text in docs)
+        source = labels_csv
+    else:
+        nlp = load_model(model, stoplists=stoplists)
+        spans = model_spans(nlp, (text for _, text in docs), stoplists, batch_size)
+        source = model_name(model)
+
+    make_doc = spacy.blank("en").make_doc
+    bins = {"train": DocBin(), "dev": DocBin()}
+    files = {"train": [], "dev": []}
+    ents = Counter()
+    for (name, text), file_spans in zip(docs, spans):
+        split = "dev" if is_dev(name, dev_percent) else "train"
+        doc = to_doc(make_doc, text, file_spans)
+        bins[split].add(doc)
+        files[split].append(name)
+        ents[split] += len(doc.ents)
+
+    os.makedirs(data_dir, exist_ok=True)
+    for split, docbin in bins.items():
+        docbin.to_disk(os.path.join(data_dir, f"{split}.spacy"))
+    with open(os.path.join(data_dir, "split.json"), "w", encoding="utf8") as fh:
+        json.dump({"source": source, "dev_percent": dev_percent, **files}, fh, indent=2)
+
+    print(f"Silver labels from {source}:")
+    for split in bins:
+        print(f"   - {split:5}: {len(files[split])} files, {ents[split]} entities")
+    if too_long:
+        print(f"   ({too_long} files over {max_chars} characters left out)")
+    print(f"→ Written to {data_dir}/train.spacy and {data_dir}/dev.spacy")
+
+# -------------------------------------------------------------------
+# Training
+# -------------------------------------------------------------------
+
+def train(data_dir: str = DATA_DIR, output: str = DISTILLED_MODEL, max_steps: int = 2000,
+          eval_frequency: int = 200, width: int | None = None, seed: int = 0):
+    from spacy.cli.init_config import init_config
+    from spacy.cli.train import train as spacy_train
+
+    if os.path.exists(output) and not os.path.isfile(os.path.join(output, "meta.json")):
+        sys.exit(f"Error: '{output}' exists and is not a spaCy model; refusing to replace it.")
+
+    config_path = os.path.join(data_dir, "config.cfg")
+    init_config(lang="en", pipeline=["ner"], optimize="efficiency").to_disk(config_path)
+    overrides = {
+        "paths.train": os.path.join(data_dir, "train.spacy"),
+        "paths.dev": os.path.join(data_dir, "dev.spacy"),
+        "system.seed": seed,
+        "training.max_steps": max_steps,
+        "training.eval_frequency": eval_frequency,
+    }
+    if width:
+        overrides["components.tok2vec.model.encode.width"] = width
+    training_dir = os.path.join(data_dir, "training")
+    spacy_train(config_path, training_dir, overrides=overrides)
+
+    # A fresh version per training run changes model_id(), so results the
+    # extractor cached with an older distilled model are not reused
+    best = os.path.join(training_dir, "model-best")
+    meta_path = os.path.join(best, "meta.json")
+    with open(meta_path, encoding="utf8") as fh:
+        meta = json.load(fh)
+    meta.update(name="leads_ner", version=time.strftime("1.0.%Y%m%d%H%M%S"))
+    with open(meta_path, "w", encoding="utf8") as fh:
+        json.dump(meta, fh, indent=2)
+
+    if os.path.exists(output):
+        shutil.rmtree(output)
+    shutil.copytree(best, output)
+    print(f"→ Installed {meta['version']} ({dir_size_mb(output):.1f} MB) at {output}; "
+          f"use it with --model distilled")
+
+# -------------------------------------------------------------------
+# Evaluation
+# -------------------------------------------------------------------
+
+def dir_size_mb(path: str) -> float:
+    return sum(os.path.getsize(os.path.join(root, f))
+               for root, _, names in os.walk(path) for f in names) / 1e6
+
+def model_size_mb(name: str) -> float | None:
+    try:
+        path = name if os.path.isdir(name) else str(spacy.util.get_package_path(name))
+    except Exception:
+        return None
+    return round(dir_size_mb(path), 1)
+
+def prf(gold: set, pred: set) -> dict:
+    tp = len(gold & pred)
+    p = tp / len(pred) if pred else 0.0
+    r = tp / len(gold) if gold else 0.0
+    f = 2 * p * r / (p + r) if p + r else 0.0
+    return {"precision": round(p, 4), "recall": round(r, 4), "f1": round(f, 4),
+            "gold": len(gold), "predicted": len(pred)}
+
+def scores(gold: set, pred: set) -> dict:
+    """Overall and per-type P/R/F1 over (doc, type, ...) tuples."""
+    out = {"all": prf(gold, pred)}
+    for kind in LABELS:
+        out[kind] = prf({g for g in gold if g[1] == kind}, {p for p in pred if p[1] == kind})
+    return out
+
+def entities(mentions, texts) -> set:
+    """Distinct normalized entities per document: what a --dedupe'd CSV reports."""
+    return {(i, kind, normalize_entity(kind, texts[i][start:end].strip())) for i, kind, start, end in mentions}
+
+def evaluate(data_dir: str = DATA_DIR, models=(DEFAULT_MODEL, "distilled"), gold_path: str | None = None,
+             stoplist_path: str | None = None, batch_size: int = 16, output: str | None = None) -> dict:
+    gold_path = gold_path or os.path.join(data_dir, "dev.spacy")
+    vocab = spacy.blank("en").vocab
+    gold_docs = list(DocBin().from_disk(gold_path).get_docs(vocab))
+    texts = [doc.text for doc in gold_docs]
+    n_bytes = sum(len(text.encode("utf8")) for text in texts)
+    gold = {(i, TYPES[ent.label_], ent.start_char, ent.end_char)
+            for i, doc in enumerate(gold_docs) for ent in doc.ents if ent.label_ in TYPES}
+    stoplists = load_stoplists(stoplist_path) if stoplist_path else DEFAULT_STOPLISTS
+    print(f"Held-out set {gold_path}: {len(texts)} docs, {n_bytes / 1e6:.2f} MB, {len(gold)} entities")
+
+    results = []
+    for model in models:
+        name = model_name(model)
+        try:
+            nlp = load_model(model, stoplists=stoplists)
+        except (ImportError, OSError) as e:
+            print(f"   skipping {model}: {e}")
+            continue
+        t0 = time.perf_counter()
+        pred = {(i, kind, start, end)
+                for i, doc in enumerate(nlp.pipe(texts, batch_size=batch_size))
+                for kind, _, start, end in entity_mentions(doc, stoplists)}
+        seconds = time.perf_counter() - t0
+        results.append({
+            "model": model,
+            "name": name,
+            "load_seconds": round(LOAD_TIMES[name], 3),
+            "size_mb": model_size_mb(name),
+            "seconds": round(seconds, 4),
+            "docs_per_sec": round(len(texts) / seconds, 2) if seconds else None,
+            "mentions": scores(gold, pred),
+            "entities": scores(entities(gold, texts), entities(pred, texts)),
+        })
+
+    w = max([12] + [len(r["model"]) for r in results])
+    print(f"\n   {'model':{w}} {'docs/s':>9} {'load s':>7} {'MB':>7}   "
+          f"{'mention P/R/F1':>20}   {'entity P/R/F1':>20}")
+    for r in results:
+        m, e = r["mentions"]["all"], r["entities"]["all"]
+        print(f"   {r['model']:{w}} {r['docs_per_sec']:>9} {r['load_seconds']:>7} {r['size_mb']!s:>7}   "
+              f"{m['precision']:.3f}/{m['recall']:.3f}/{m['f1']:.3f}   "
+              f"{e['precision']:.3f}/{e['recall']:.3f}/{e['f1']:.3f}")
+        for kind in LABELS:
+            k = r["mentions"][kind]
+            print(f"   {'':{w}} {kind:>26} {k['precision']:.3f}/{k['recall']:.3f}/{k['f1']:.3f}")
+    if len(results) > 1 and results[0]["docs_per_sec"] and results[-1]["docs_per_sec"]:
+        speedup = results[-1]["docs_per_sec"] / results[0]["docs_per_sec"]
+        print(f"→ {results[-1]['model']} is {speedup:.1f}x the throughput of {results[0]['model']}")
+
+    report = {
+        "meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "gold": gold_path,
+                 "docs": len(texts), "bytes": n_bytes, "batch_size": batch_size},
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"→ Results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Train and evaluate a distilled NER model for the extractor")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    lp = sub.add_parser("label", help="Write silver train/dev data from the current extractor")
+    lp.add_argument("input_dir", nargs="?", default="../cleaned_data")
+    lp.add_argument("--labels", help="Take labels from this leads_with_context.csv instead of running NER")
+    lp.add_argument("--model", default=DEFAULT_MODEL, help="Teacher model when --labels is not given")
+    lp.add_argument("--stoplist", help="Stoplists the teacher run should use")
+    lp.add_argument("--input-format", choices=INPUT_FORMATS, default="txt")
+    lp.add_argument("--dev-percent", type=int, default=20, help="Share of files held out for evaluation")
+    lp.add_argument("--max-chars", type=int, default=DEFAULT_CHUNK_SIZE,
+                    help="Leave out files longer than this")
+    lp.add_argument("--batch-size", type=int, default=16)
+    lp.add_argument("--data", default=DATA_DIR, help="Directory for the .spacy files")
+
+    tp = sub.add_parser("train", help="Train the distilled model on the silver data")
+    tp.add_argument("--data", default=DATA_DIR)
+    tp.add_argument("--output", default=DISTILLED_MODEL, help="Where to install the best model")
+    tp.add_argument("--max-steps", type=int, default=2000)
+    tp.add_argument("--eval-frequency", type=int, default=200)
+    tp.add_argument("--width", type=int, help="tok2vec width (spaCy's efficiency default is 96)")
+    tp.add_argument("--seed", type=int, default=0)
+
+    ep = sub.add_parser("evaluate", help="Compare models on the held-out set")
+    ep.add_argument("--data", default=DATA_DIR)
+    ep.add_argument("--gold", help="DocBin with reference labels (default: DATA/dev.spacy)")
+    ep.add_argument("--models", nargs="+", default=[DEFAULT_MODEL, "distilled"],
+                    help="Models to score; the first is the baseline")
+    ep.add_argument("--stoplist")
+    ep.add_argument("--batch-size", type=int, default=16)
+    ep.add_argument("--output", default="distill_eval.json", help="Where to write the JSON results")
+
+    args = p.parse_args()
+    if args.command == "label":
+        if not os.path.isdir(args.input_dir):
+            sys.exit(f"Error: '{args.input_dir}' is not a directory.")
+        label(args.input_dir, args.data, labels_csv=args.labels, model=args.model,
+              stoplist_path=args.stoplist, input_format=args.input_format,
+              dev_percent=args.dev_percent, max_chars=args.max_chars, batch_size=args.batch_size)
+    elif args.command == "train":
+        train(args.data, args.output, max_steps=args.max_steps, eval_frequency=args.eval_frequency,
+              width=args.width, seed=args.seed)
+    else:
+        evaluate(args.data, args.models, gold_path=args.gold, stoplist_path=args.stoplist,
+                 batch_size=args.batch_size, output=args.output)
@@ -0,0 +1,47 @@
+"""
+Importable lead extraction engine.
+
+    from extractor import extract, extract_many
+
+    records = extract(text, "page.txt")
+    for name, records in extract_many(pairs, n_process=4):
+        ...
+
+Importing the package has no side effects; the spaCy model is loaded
+lazily on first use and cached per process (see extractor.model).
+"""
+
+from .chunking import DEFAULT_CHUNK_SIZE, MIN_CHUNK_SIZE, extract_chunked, iter_chunks
+from .core import (
+    EXTRACTOR_VERSION,
+    MODES,
+    clean_url,
+    contact_records,
+    context_snippet,
+    extract,
+    extract_many,
+    needs_ner,
+    records_from_doc,
+)
+from .model import DEFAULT_MODEL, LOAD_TIMES, MODEL_SIZES, load_model, model_name
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "DEFAULT_MODEL",
+    "EXTRACTOR_VERSION",
+    "LOAD_TIMES",
+    "MIN_CHUNK_SIZE",
+    "MODEL_SIZES",
+    "MODES",
+    "clean_url",
+    "contact_records",
+    "context_snippet",
+    "extract",
+    "extract_chunked",
+    "extract_many",
+    "iter_chunks",
+    "load_model",
+    "model_name",
+    "needs_ner",
+    "records_from_doc",
+]
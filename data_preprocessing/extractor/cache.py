@@ -0,0 +1,70 @@
+"""
+Persistent SQLite store of per-file extraction results.
+
+Entries are keyed by the SHA-256 of the file contents together with the
+spaCy model name and the extractor version, so a file is only re-processed
+when its text, the model or the extraction logic changes.  Every result is
+committed as soon as it is stored, which lets an interrupted run pick up
+where it stopped.
+"""
+
+import hashlib
+import json
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    digest  TEXT NOT NULL,
+    model   TEXT NOT NULL,
+    version TEXT NOT NULL,
+    records TEXT NOT NULL,
+    PRIMARY KEY (digest, model, version)
+)
+"""
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path: str, model: str, version: str):
+        self.model = model
+        self.version = version
+        # Concurrent --shard runs may share one cache file, so wait out their locks
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def get(self, digest: str, filename: str) -> list[dict] | None:
+        row = self.conn.execute(
+            "SELECT records FROM results WHERE digest=? AND model=? AND version=?",
+            (digest, self.model, self.version),
+        ).fetchone()
+        if row is None:
+            return None
+        # Records are stored without the filename so identical files share one entry
+        return [{"file": filename, **r} for r in json.loads(row[0])]
+
+    def put(self, digest: str, records: list[dict]):
+        payload = json.dumps([{k: v for k, v in r.items() if k != "file"} for r in records])
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (digest, model, version, records) VALUES (?, ?, ?, ?)",
+            (digest, self.model, self.version, payload),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,94 @@
+"""
+Bounded-memory extraction for documents too large to process in one piece.
+
+iter_chunks() reads a file in fixed-size blocks and cuts it into
+overlapping chunks, preferring paragraph, then sentence, then whitespace
+boundaries.  Each chunk "owns" the mentions that start between the
+midpoints of its overlaps with its neighbours, so every mention is reported
+exactly once and always with at least overlap/2 characters of context on
+either side.  Only one chunk (and its Doc) is held in memory at a time.
+Unless given, the overlap is DEFAULT_OVERLAP capped at an eighth of the
+chunk size, so any chunk size from MIN_CHUNK_SIZE up works.
+"""
+
+import re
+from typing import NamedTuple
+
+from .core import build_records, contact_mentions, entity_mentions, needs_ner
+from .metrics import timed
+from .model import DEFAULT_MODEL, load_model
+from .validators import DEFAULT_STOPLISTS
+
+DEFAULT_CHUNK_SIZE = 200_000
+DEFAULT_OVERLAP = 2_000
+MIN_CHUNK_SIZE = 1_000
+
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+SENTENCE_BREAK = re.compile(r'[\.\?\!]\s+')
+WHITESPACE = re.compile(r'\s+')
+
+
+class Chunk(NamedTuple):
+    offset: int     # global character offset of text[0]
+    text: str
+    keep_from: int  # local offsets of the region whose mentions this chunk reports
+    keep_to: int
+
+
+def split_point(buf: str, limit: int) -> int:
+    """Best cut position in buf[limit // 2:limit], by boundary preference."""
+    for pattern in (PARAGRAPH_BREAK, SENTENCE_BREAK, WHITESPACE):
+        last = None
+        for last in pattern.finditer(buf, limit // 2, limit):
+            pass
+        if last is not None:
+            return last.end()
+    return limit
+
+
+def default_overlap(chunk_size: int) -> int:
+    return min(DEFAULT_OVERLAP, chunk_size // 8)
+
+
+def iter_chunks(fh, chunk_size: int = DEFAULT_CHUNK_SIZE, overlap: int | None = None):
+    """Yield Chunks covering the text read from file object fh."""
+    if overlap is None:
+        overlap = default_overlap(chunk_size)
+    if not 0 <= overlap < chunk_size // 4:
+        raise ValueError("overlap must be smaller than a quarter of chunk_size")
+
+    buf, base, keep_from, eof = "", 0, 0, False
+    while True:
+        while not eof and len(buf) < chunk_size:
+            block = fh.read(chunk_size - len(buf))
+            eof = not block
+            buf += block
+        if eof:
+            yield Chunk(base, buf, keep_from, len(buf))
+            return
+
+        cut = split_point(buf, chunk_size)
+        nxt = cut - overlap
+        mid = (nxt + cut) // 2
+        yield Chunk(base, buf[:cut], keep_from, mid)
+        buf, base, keep_from = buf[nxt:], base + nxt, mid - nxt
+
+
+def extract_chunked(path: str, filename: str, mode: str = "full", model: str = DEFAULT_MODEL,
+                    all_mentions: bool = False, stoplists=DEFAULT_STOPLISTS,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, overlap: int | None = None) -> list[dict]:
+    """Extract records from a file chunk by chunk; same output shape as extract()."""
+    nlp = load_model(model, stoplists=stoplists) if mode != "contacts" else None
+    seen = set()
+    records = []
+    with open(path, encoding="utf8", errors="ignore") as fh:
+        for chunk in iter_chunks(fh, chunk_size, overlap):
+            mentions = []
+            if mode == "full" or (mode == "tiered" and needs_ner(chunk.text)):
+                with timed("ner"):
+                    doc = nlp(chunk.text)
+                mentions += entity_mentions(doc, stoplists)
+            mentions += contact_mentions(chunk.text)
+            owned = [m for m in mentions if chunk.keep_from <= m[2] < chunk.keep_to]
+            records += build_records(chunk.text, filename, owned, all_mentions, seen)
+    return records
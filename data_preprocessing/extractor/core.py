@@ -0,0 +1,254 @@
+"""
+Entity & context extraction over in-memory text.
+
+extract() handles a single document, extract_many() streams (text, name)
+pairs through nlp.pipe and yields results in input order.  The spaCy model
+is only loaded when a mode actually needs NER.
+"""
+
+import re
+from collections import deque
+from urllib.parse import urlparse
+
+from .gate import classify
+from .metrics import timed
+from .model import DEFAULT_MODEL, load_model
+from .phones import find_phone_numbers
+from .validators import DEFAULT_STOPLISTS, validate_batch
+
+# Bump whenever extraction logic changes so cached results are invalidated
+EXTRACTOR_VERSION = "7"
+
+MODES = ("full", "contacts", "tiered")
+
+SENTENCE_END = re.compile(r'[\.\?\!]\s+')
+URL_RE = re.compile(r'https?://[^\s<>"\[\]{}|\\^`]+')
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PEOPLE_SIGNAL = re.compile(
+    r'\b(?:co-?founder|founder|ceo|cto|cfo|coo|president|director|owner|head of)\b'
+    r'|linkedin\.com/in/',
+    re.IGNORECASE,
+)
+
+
+def context_snippet(text: str, start: int, end: int, window: int = 80) -> str:
+    """
+    Snippet around text[start:end], widened by `window` characters on each
+    side and trimmed to the enclosing sentence where a boundary falls inside.
+    """
+    lo = max(0, start - window)
+    hi = min(len(text), end + window)
+    # Last sentence break before the mention
+    for m in SENTENCE_END.finditer(text, lo, start):
+        lo = m.end()
+    # First sentence break after the mention
+    m = SENTENCE_END.search(text, end, hi)
+    if m:
+        hi = m.start() + 1
+    return text[lo:hi].strip().replace("\r", " ").replace("\n", " ")
+
+
+def clean_url(url: str) -> str | None:
+    url = url.strip().rstrip('.,;!?')
+    try:
+        p = urlparse(url)
+        if not (p.scheme and p.netloc):
+            return None
+    except ValueError:
+        return None
+    if any(domain in url.lower() for domain in ("example.com", "localhost")):
+        return None
+    return url
+
+
+# Contact types are reported once per file unless all_mentions is set
+ONCE_PER_FILE = frozenset({"url", "email", "phone"})
+
+
+def entity_mentions(doc, stoplists=DEFAULT_STOPLISTS) -> list[tuple[str, str, int, int]]:
+    """(type, entity, start, end) for every validated PERSON / ORG in a Doc."""
+    with timed("validate"):
+        return [
+            ("person" if ent.label_ == "PERSON" else "organization",
+             ent.text.strip(), ent.start_char, ent.end_char)
+            for ent in validate_batch(doc.ents, stoplists)
+        ]
+
+
+def contact_mentions(text: str) -> list[tuple[str, str, int, int]]:
+    """(type, entity, start, end) for every URL, email and phone mention in text."""
+    mentions = []
+
+    with timed("regex"):
+        # URLs
+        for m in URL_RE.finditer(text):
+            clean = clean_url(m.group())
+            if clean:
+                mentions.append(("url", clean, m.start(), m.start() + len(clean)))
+
+        # Emails
+        for m in EMAIL_RE.finditer(text):
+            email = m.group()
+            if not any(fake in email.lower() for fake in ("example", "test", "fake")):
+                mentions.append(("email", email, m.start(), m.end()))
+
+    # Phones
+    with timed("phones"):
+        for phone, start, end in find_phone_numbers(text):
+            mentions.append(("phone", phone, start, end))
+
+    return mentions
+
+
+def build_records(text: str, filename: str, mentions, all_mentions: bool = False,
+                  seen: set | None = None) -> list[dict]:
+    """
+    Turn mentions into CSV records with offset-based snippets. `seen` tracks
+    contacts already reported for this file and may be shared between calls.
+    """
+    seen = set() if seen is None else seen
+    records = []
+    with timed("snippets"):
+        for kind, entity, start, end in mentions:
+            if not all_mentions and kind in ONCE_PER_FILE:
+                if (kind, entity) in seen:
+                    continue
+                seen.add((kind, entity))
+            records.append({
+                "file": filename,
+                "type": kind,
+                "entity": entity,
+                "snippet": context_snippet(text, start, end)
+            })
+    return records
+
+
+def records_from_doc(doc, filename: str, all_mentions: bool = False,
+                     stoplists=DEFAULT_STOPLISTS) -> list[dict]:
+    """
+    Build CSV records from a processed Doc. PERSON/ORG are reported per
+    mention, contacts as in contact_records().
+    """
+    mentions = entity_mentions(doc, stoplists) + contact_mentions(doc.text)
+    return build_records(doc.text, filename, mentions, all_mentions)
+
+
+def contact_records(text: str, filename: str, all_mentions: bool = False) -> list[dict]:
+    """
+    URL, email and phone records from plain text (no spaCy needed). Each is
+    reported once per file (first mention) unless all_mentions is set.
+    """
+    return build_records(text, filename, contact_mentions(text), all_mentions)
+
+
+def needs_ner(text: str) -> bool:
+    return bool(PEOPLE_SIGNAL.search(text) or EMAIL_RE.search(text))
+
+
+def _route(text: str, name: str, mode: str, gate: bool, decisions: dict | None) -> str:
+    """
+    'ner', 'contacts' or 'skip' for one document.  With gate, the route
+    actually taken is stored in `decisions` with the gate's own verdict.
+    """
+    verdict = reason = None
+    features = {}
+    if gate:
+        with timed("gate"):
+            verdict, reason, features = classify(text)
+    if verdict in ("contacts", "skip"):
+        route = verdict
+    elif mode == "contacts":
+        route, reason = "contacts", "contacts mode"
+    elif mode == "tiered" and not needs_ner(text):
+        route, reason = "contacts", "no people signals"
+    else:
+        route = "ner"
+    if gate and decisions is not None:
+        decisions[name] = {"route": route, "verdict": verdict, "reason": reason, **features}
+    return route
+
+
+def extract(text: str, filename: str = "", mode: str = "full", model: str = DEFAULT_MODEL,
+            all_mentions: bool = False, stoplists=DEFAULT_STOPLISTS, gate: bool = False) -> list[dict]:
+    """Extract lead records from a single document."""
+    route = _route(text, filename, mode, gate, None)
+    if route == "skip":
+        return []
+    if route == "contacts":
+        return contact_records(text, filename, all_mentions)
+    nlp = load_model(model, stoplists=stoplists)
+    with timed("ner"):
+        doc = nlp(text)
+    return records_from_doc(doc, filename, all_mentions, stoplists)
+
+
+def _timed_pipe(docs):
+    """Iterate nlp.pipe output, timing each pull as the "ner" stage."""
+    docs = iter(docs)
+    while True:
+        with timed("ner"):
+            item = next(docs, None)
+        if item is None:
+            return
+        yield item
+
+
+def extract_many(items, mode: str = "full", model: str = DEFAULT_MODEL, batch_size: int = 16,
+                 n_process: int = 1, all_mentions: bool = False, stoplists=DEFAULT_STOPLISTS,
+                 gate: bool = False, decisions: dict | None = None):
+    """
+    Extract records from an iterable of texts or (text, name) pairs and yield
+    (name, records) in input order. Plain strings get an empty name.
+
+    full      every document goes through nlp.pipe
+    contacts  URL/email/phone regexes only; spaCy is never loaded
+    tiered    NER only for documents where needs_ner() finds people signals
+
+    With gate, extractor.gate.classify() runs first and can demote a
+    document to contacts-only or skip it (no records); its decision is
+    stored under the document's name in `decisions` if one is given.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+    items = (item if isinstance(item, tuple) else (item, "") for item in items)
+
+    if mode == "contacts":
+        for text, name in items:
+            if gate and _route(text, name, mode, gate, decisions) == "skip":
+                yield name, []
+            else:
+                yield name, contact_records(text, name, all_mentions)
+        return
+
+    nlp = load_model(model, stoplists=stoplists)
+    if mode == "full" and not gate:
+        docs = nlp.pipe(items, as_tuples=True, batch_size=batch_size, n_process=n_process)
+        for doc, name in _timed_pipe(docs):
+            yield name, records_from_doc(doc, name, all_mentions, stoplists)
+        return
+
+    # tiered or gated: route while feeding nlp.pipe. Contact-only and skipped
+    # documents are resolved immediately and wait in `pending` (without their
+    # text) until every earlier NER document has come back, which keeps the
+    # output in order.
+    pending = deque()
+
+    def ner_items():
+        for text, name in items:
+            route = _route(text, name, mode, gate, decisions)
+            if route == "ner":
+                pending.append((name, None))
+                yield text, name
+            else:
+                pending.append((name, [] if route == "skip" else contact_records(text, name, all_mentions)))
+
+    docs = nlp.pipe(ner_items(), as_tuples=True, batch_size=batch_size, n_process=n_process)
+    for doc, name in _timed_pipe(docs):
+        while True:
+            queued, records = pending.popleft()
+            if records is None:
+                yield name, records_from_doc(doc, name, all_mentions, stoplists)
+                break
+            yield queued, records
+    while pending:
+        yield pending.popleft()
@@ -0,0 +1,97 @@
+"""
+Near-duplicate document detection with MinHash + LSH.
+
+Documents are shingled into overlapping word 5-grams and summarised by a
+64-value MinHash signature: each shingle is hashed once with crc32 and
+then permuted by 64 universal hash functions (a*h + b) mod p with fixed
+coefficients, so signatures are stable across runs and processes.  The
+signature is cut into 8 bands of 8 rows; documents sharing any band are
+candidates, and a candidate counts as a near-duplicate when the estimated
+Jaccard similarity of their shingle sets reaches the threshold.  With these
+parameters pairs at 0.9 similarity are found ~99% of the time while pairs
+below ~0.6 are rarely even compared.
+"""
+
+import random
+import re
+import zlib
+
+DEFAULT_THRESHOLD = 0.9
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 8
+
+WORD = re.compile(r'\w+')
+
+# Mersenne prime above the 32-bit crc32 range
+_PRIME = (1 << 61) - 1
+
+# One seeded generator, so the permutations differ from each other but
+# signatures stay comparable between runs
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = tuple((_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM))
+del _rng
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """crc32 hashes of the lowercased word n-grams of text."""
+    words = WORD.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+
+def signature(text: str) -> tuple[int, ...] | None:
+    """MinHash signature of text, or None if it has no words."""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.signatures = {}
+        self.buckets = [{} for _ in range(BANDS)]  # per band: band values -> [keys]
+
+    def _bands(self, sig):
+        rows = NUM_PERM // BANDS
+        return (sig[i * rows:(i + 1) * rows] for i in range(BANDS))
+
+    def query(self, sig) -> tuple[str, float] | None:
+        """Most similar indexed key at or above the threshold, with its similarity."""
+        best = None
+        seen = set()
+        for bucket, band in zip(self.buckets, self._bands(sig)):
+            for key in bucket.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                sim = similarity(sig, self.signatures[key])
+                if sim >= self.threshold and (best is None or sim > best[1]):
+                    best = (key, sim)
+        return best
+
+    def add(self, key: str, sig):
+        self.signatures[key] = sig
+        for bucket, band in zip(self.buckets, self._bands(sig)):
+            bucket.setdefault(band, []).append(key)
+
+    def match_or_add(self, key: str, text: str) -> tuple[str, float] | None:
+        """
+        Return (original key, similarity) if text near-duplicates an indexed
+        document; otherwise index it under key and return None.
+        """
+        sig = signature(text)
+        if sig is None:
+            return None
+        match = self.query(sig)
+        if match is None:
+            self.add(key, sig)
+        return match
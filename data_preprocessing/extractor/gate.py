@@ -0,0 +1,78 @@
+"""
+Cheap pre-extraction gate.
+
+classify() looks at a document's length, character classes, English
+stopword hit rate and link density (a couple of regex scans, no spaCy) and
+routes it to:
+
+    ner       worth running NER on (as far as the extraction mode allows)
+    contacts  URLs/emails/phones only: short snippets, digit-heavy pages
+              (directories, price lists), non-English, non-Latin script or
+              navigation/link-list pages where NER returns garbage
+    skip      nothing to extract: empty pages and binary-ish dumps
+
+Only text that cannot hold a contact is skipped; everything else at least
+gets the contact regexes.
+"""
+
+import re
+
+MIN_CHARS = 40              # shorter than this: contacts only
+MAX_CONTROL_RATIO = 0.02    # control / replacement characters: binary dump
+MIN_LETTER_RATIO = 0.35     # letters among non-space characters
+MIN_LATIN_RATIO = 0.7       # ASCII letters among letters
+MAX_LINK_DENSITY = 0.5      # characters inside URLs
+MIN_STOPWORD_RATE = 0.08    # English stopwords among words ...
+MIN_WORDS_FOR_STOPWORDS = 30  # ... judged only on documents this long
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be because been but by can could
+did do does for from had has have he her his how i if in into is it its just
+me more most my no not of on one or our out over she so some than that the
+their them then there these they this to up us was we were what when where
+which who will with would you your
+""".split())
+
+WORD = re.compile(r"[^\W\d_]+")
+URL = re.compile(r'https?://\S+|www\.\S+')
+CONTROL = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f�]')
+NON_SPACE = re.compile(r'\S')
+ASCII_LETTER = re.compile(r'[A-Za-z]')
+
+
+def features(text: str) -> dict:
+    chars = len(text)
+    non_space = len(NON_SPACE.findall(text)) or 1
+    words = WORD.findall(text)
+    letters = sum(len(w) for w in words)
+    return {
+        "chars": chars,
+        "words": len(words),
+        "control_ratio": len(CONTROL.findall(text)) / (chars or 1),
+        "letter_ratio": letters / non_space,
+        "latin_ratio": len(ASCII_LETTER.findall(text)) / (letters or 1),
+        "link_density": sum(len(m) for m in URL.findall(text)) / (chars or 1),
+        "stopword_rate": sum(w.lower() in STOPWORDS for w in words) / (len(words) or 1),
+    }
+
+
+def classify(text: str) -> tuple[str, str, dict]:
+    """(route, reason, features) for a document."""
+    f = features(text)
+    if not text.strip():
+        route, reason = "skip", "empty"
+    elif f["control_ratio"] > MAX_CONTROL_RATIO:
+        route, reason = "skip", "binary"
+    elif len(text.strip()) < MIN_CHARS:
+        route, reason = "contacts", "too short"
+    elif f["link_density"] > MAX_LINK_DENSITY:
+        route, reason = "contacts", "link list"
+    elif f["letter_ratio"] < MIN_LETTER_RATIO:
+        route, reason = "contacts", "few letters"
+    elif f["latin_ratio"] < MIN_LATIN_RATIO:
+        route, reason = "contacts", "non-latin script"
+    elif f["words"] >= MIN_WORDS_FOR_STOPWORDS and f["stopword_rate"] < MIN_STOPWORD_RATE:
+        route, reason = "contacts", "non-english or navigation"
+    else:
+        route, reason = "ner", "prose"
+    return route, reason, {k: round(v, 3) if isinstance(v, float) else v for k, v in f.items()}
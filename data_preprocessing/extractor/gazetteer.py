@@ -0,0 +1,94 @@
+"""
+Gazetteer pipeline component.
+
+Runs right after "ner" and applies the stoplists' phrase lists inside the
+spaCy pipeline with one PhraseMatcher pass over the document:
+
+    companies     spans are labelled ORG, overriding whatever NER said
+    platforms     an entity covering exactly such a span becomes PLATFORM,
+                  so sites like GitHub or LinkedIn stop showing up as
+                  organization leads; longer names that merely contain one
+                  ("Slack Technologies", "Medium Rare Capital") are kept
+    person        a PERSON entity covering exactly such a span is dropped
+    organization  an ORG entity covering exactly such a span is dropped
+
+Matching is on lowercased tokens and PhraseMatcher looks phrases up by
+hash, so the cost grows with the text, not with the size of the lists.
+The rule-based checks in extractor.validators still run afterwards.
+"""
+
+from .validators import DEFAULT_STOPLISTS
+
+COMPONENT = "lead_gazetteer"
+# PhraseMatcher match keys
+COMPANY, PLATFORM, NOT_PERSON, NOT_ORG = "COMPANY", "PLATFORM", "NOT_PERSON", "NOT_ORG"
+
+
+class GazetteerComponent:
+    def __init__(self, nlp, name: str = COMPONENT):
+        from spacy.matcher import PhraseMatcher
+
+        self.name = name
+        self.vocab = nlp.vocab
+        self.tokenizer = nlp.tokenizer
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+
+    def set_stoplists(self, stoplists=DEFAULT_STOPLISTS):
+        """(Re)build the matcher from a Stoplists bundle."""
+        for key in (COMPANY, PLATFORM, NOT_PERSON, NOT_ORG):
+            if key in self.matcher:
+                self.matcher.remove(key)
+        for key, terms in ((COMPANY, stoplists.companies), (PLATFORM, stoplists.platforms),
+                           (NOT_PERSON, stoplists.person), (NOT_ORG, stoplists.organization)):
+            if terms:
+                # Tokenizer only: far cheaper than nlp.pipe for large lists
+                self.matcher.add(key, list(self.tokenizer.pipe(sorted(terms))))
+        return self
+
+    def __call__(self, doc):
+        from spacy.tokens import Span
+        from spacy.util import filter_spans
+
+        strings = self.vocab.strings
+        forced, platforms, suppressed = [], set(), set()
+        for match_id, start, end in self.matcher(doc):
+            key = strings[match_id]
+            if key == COMPANY:
+                forced.append(Span(doc, start, end, label="ORG"))
+            elif key == PLATFORM:
+                platforms.add((start, end))
+            elif key == NOT_PERSON:
+                suppressed.add((start, end, "PERSON"))
+            else:
+                suppressed.add((start, end, "ORG"))
+        if not forced and not platforms and not suppressed:
+            return doc
+
+        forced = filter_spans(forced)
+        covered = {i for span in forced for i in range(span.start, span.end)}
+        kept = [
+            ent for ent in doc.ents
+            if (ent.start, ent.end, ent.label_) not in suppressed
+            and not covered.intersection(range(ent.start, ent.end))
+        ]
+        kept = [
+            Span(doc, ent.start, ent.end, label="PLATFORM")
+            if (ent.start, ent.end) in platforms else ent
+            for ent in kept
+        ]
+        doc.ents = sorted(kept + forced, key=lambda span: span.start)
+        return doc
+
+
+def add_gazetteer(nlp, stoplists=DEFAULT_STOPLISTS):
+    """Insert the gazetteer component after "ner" (or last) and load stoplists into it."""
+    from spacy.language import Language
+
+    if not Language.has_factory(COMPONENT):
+        Language.factory(COMPONENT, func=lambda nlp, name: GazetteerComponent(nlp, name))
+    if COMPONENT in nlp.pipe_names:
+        nlp.remove_pipe(COMPONENT)
+    where = {"after": "ner"} if "ner" in nlp.pipe_names else {}
+    component = nlp.add_pipe(COMPONENT, **where)
+    component.set_stoplists(stoplists)
+    return nlp
@@ -0,0 +1,116 @@
+"""
+Cross-file entity index.
+
+Entities are keyed by (type, normalized entity) so surface variants of the
+same lead collapse into one entry: names are case-folded and whitespace-
+normalized, organizations also lose legal suffixes ("Inc", "Ltd", ...),
+emails are lowercased, URLs reduce to their registrable domain and phones
+to their digits.  Each entry keeps per-file mention counts (postings), the
+most common surface form and the first snippet seen.
+"""
+
+import json
+import re
+from collections import Counter
+from urllib.parse import urlparse
+
+ORG_SUFFIXES = re.compile(
+    r'(?:[\s,]+(?:inc|llc|ltd|limited|corp|corporation|co|company|gmbh|plc|pvt|private|pte|sa|ag|bv)\.?)+$'
+)
+PUNCT = re.compile(r"[^\w\s&@.+'-]")
+SPACES = re.compile(r'\s+')
+NON_DIGIT = re.compile(r'\D')
+
+# Second-level labels under which registrations happen one level deeper (foo.co.uk)
+SECOND_LEVEL = frozenset({
+    "co", "com", "net", "org", "gov", "edu", "ac", "ltd", "plc", "gen", "firm", "ind", "nic",
+})
+
+
+def registrable_domain(url: str) -> str:
+    host = urlparse(url if "://" in url else "//" + url).hostname or ""
+    labels = host.lower().rstrip(".").split(".")
+    if labels and labels[0] == "www":
+        labels = labels[1:]
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def normalize_entity(kind: str, entity: str) -> str:
+    if kind == "email":
+        return entity.strip().lower()
+    if kind == "url":
+        return registrable_domain(entity.strip())
+    if kind == "phone":
+        return ("+" if entity.strip().startswith("+") else "") + NON_DIGIT.sub("", entity)
+    key = SPACES.sub(" ", PUNCT.sub(" ", entity.casefold())).strip(" .-'")
+    if kind == "organization":
+        key = ORG_SUFFIXES.sub("", key).strip() or key
+    return key
+
+
+class EntityIndex:
+    def __init__(self):
+        # (type, key) -> {"forms": Counter, "files": Counter, "snippet": str}
+        self.entries = {}
+
+    def add(self, kind: str, entity: str, filename: str, snippet: str = "", count: int = 1):
+        k = (kind, normalize_entity(kind, entity))
+        entry = self.entries.get(k)
+        if entry is None:
+            entry = self.entries[k] = {"forms": Counter(), "files": Counter(), "snippet": snippet}
+        entry["forms"][entity] += count
+        entry["files"][filename] += count
+        if not entry["snippet"]:
+            entry["snippet"] = snippet
+
+    def add_records(self, records: list[dict]):
+        for r in records:
+            self.add(r["type"], r["entity"], r["file"], r.get("snippet", ""))
+
+    def count(self, kind: str) -> int:
+        """Distinct normalized entities of a type."""
+        return sum(1 for t, _ in self.entries if t == kind)
+
+    def postings(self, kind: str) -> int:
+        """Number of (entity, file) pairs of a type."""
+        return sum(len(e["files"]) for (t, _), e in self.entries.items() if t == kind)
+
+    def entities(self, kind: str) -> list[str]:
+        """Most common surface form of each distinct entity of a type."""
+        return sorted(e["forms"].most_common(1)[0][0] for (t, _), e in self.entries.items() if t == kind)
+
+    def rows(self):
+        """One deduplicated row per normalized entity, most mentioned first."""
+        ordered = sorted(self.entries.items(), key=lambda kv: (kv[0][0], -sum(kv[1]["files"].values()), kv[0][1]))
+        for (kind, key), e in ordered:
+            yield {
+                "type": kind,
+                "entity": e["forms"].most_common(1)[0][0],
+                "key": key,
+                "mentions": sum(e["files"].values()),
+                "files": ";".join(sorted(e["files"])),
+                "snippet": e["snippet"],
+            }
+
+    def save(self, path: str):
+        data = [
+            {"type": kind, "key": key, "forms": dict(e["forms"]), "files": dict(e["files"]),
+             "snippet": e["snippet"]}
+            for (kind, key), e in self.entries.items()
+        ]
+        with open(path, "w", encoding="utf8") as fh:
+            json.dump(data, fh, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "EntityIndex":
+        index = cls()
+        with open(path, encoding="utf8") as fh:
+            for item in json.load(fh):
+                index.entries[(item["type"], item["key"])] = {
+                    "forms": Counter(item["forms"]),
+                    "files": Counter(item["files"]),
+                    "snippet": item["snippet"],
+                }
+        return index
@@ -0,0 +1,144 @@
+"""
+Per-document and per-stage instrumentation for extraction runs.
+
+Library code marks its stages with `with timed("phones"): ...`.  When no
+Metrics collector is active this is a no-op; when one is, the stage's wall
+and CPU time are added to the document currently being processed.  Stage
+times are exclusive: time spent in a nested stage (e.g. "read" while
+nlp.pipe pulls the next batch inside "ner") is not also counted in the
+outer one.
+
+Because nlp.pipe works in batches, NER time lands on the document whose
+turn triggered the batch; run with --batch-size 1 for exact per-document
+NER figures.  Only the thread that activated the collector is timed;
+stages run on helper threads (e.g. a pool's task feeder) are ignored.
+"""
+
+import heapq
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+_active = None
+
+
+def _now():
+    return time.perf_counter(), time.process_time()
+
+
+class Metrics:
+    def __init__(self, path: str | None = None, slowest: int = 10):
+        self.fh = open(path, "w", encoding="utf8") if path else None
+        self.slowest_n = slowest
+        self.doc = None
+        self.stack = []
+        self.totals = {}
+        self.entities = Counter()
+        self.routes = Counter()
+        self.docs = 0
+        self.bytes = 0
+        self.slowest = []  # min-heap of (wall, file, bytes)
+        self.started = _now()
+
+    def __enter__(self):
+        global _active
+        self.thread = threading.get_ident()
+        _active = self
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = None
+        if self.fh:
+            self.fh.write(json.dumps({"summary": self.summary()}) + "\n")
+            self.fh.close()
+
+    def begin_doc(self, filename: str, size: int, cached: bool = False, **fields):
+        self.doc = {"file": filename, "bytes": size, "cached": cached, **fields, "stages": {}, "start": _now()}
+
+    def annotate(self, **fields):
+        """Add fields to the current document's line (e.g. its gate decision)."""
+        self.doc.update(fields)
+
+    def end_doc(self, records: list[dict]):
+        doc, self.doc = self.doc, None
+        wall0, cpu0 = doc.pop("start")
+        wall1, cpu1 = _now()
+        doc["wall"] = round(wall1 - wall0, 6)
+        doc["cpu"] = round(cpu1 - cpu0, 6)
+        doc["entities"] = dict(Counter(r["type"] for r in records))
+        for stage in doc["stages"].values():
+            stage["wall"] = round(stage["wall"], 6)
+            stage["cpu"] = round(stage["cpu"], 6)
+
+        self.docs += 1
+        self.bytes += doc["bytes"]
+        self.entities.update(doc["entities"])
+        if "route" in doc:
+            self.routes[doc["route"]] += 1
+        item = (doc["wall"], doc["file"], doc["bytes"])
+        if len(self.slowest) < self.slowest_n:
+            heapq.heappush(self.slowest, item)
+        else:
+            heapq.heappushpop(self.slowest, item)
+        if self.fh:
+            self.fh.write(json.dumps(doc) + "\n")
+
+    @contextmanager
+    def stage(self, name: str):
+        frame = [name, *_now(), 0.0, 0.0]  # name, wall0, cpu0, child wall, child cpu
+        self.stack.append(frame)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+            wall1, cpu1 = _now()
+            wall = wall1 - frame[1]
+            cpu = cpu1 - frame[2]
+            if self.stack:
+                self.stack[-1][3] += wall
+                self.stack[-1][4] += cpu
+            self._add(name, wall - frame[3], cpu - frame[4])
+
+    def _add(self, name: str, wall: float, cpu: float):
+        for bucket in (self.totals, self.doc["stages"] if self.doc else None):
+            if bucket is None:
+                continue
+            entry = bucket.setdefault(name, {"wall": 0.0, "cpu": 0.0})
+            entry["wall"] += wall
+            entry["cpu"] += cpu
+
+    def summary(self) -> dict:
+        wall0, cpu0 = self.started
+        wall1, cpu1 = _now()
+        return {
+            "docs": self.docs,
+            "bytes": self.bytes,
+            "wall": round(wall1 - wall0, 6),
+            "cpu": round(cpu1 - cpu0, 6),
+            "stages": {k: {"wall": round(v["wall"], 6), "cpu": round(v["cpu"], 6)}
+                       for k, v in sorted(self.totals.items(), key=lambda kv: -kv[1]["wall"])},
+            "entities": dict(self.entities),
+            "routes": dict(self.routes),
+            "slowest": [{"file": f, "wall": w, "bytes": b} for w, f, b in sorted(self.slowest, reverse=True)],
+        }
+
+    def print_summary(self):
+        s = self.summary()
+        print(f"→ Timings: {s['wall']:.2f}s wall, {s['cpu']:.2f}s CPU over {s['docs']} files")
+        for name, t in s["stages"].items():
+            print(f"   - {name:12}: {t['wall']:.3f}s wall, {t['cpu']:.3f}s CPU")
+        if s["slowest"]:
+            print(f"→ Slowest {len(s['slowest'])} files:")
+            for d in s["slowest"]:
+                print(f"   - {d['wall']:.3f}s  {d['bytes']:>10} bytes  {d['file']}")
+
+
+def timed(name: str):
+    """Time a stage against the active Metrics collector, if any."""
+    active = _active
+    if active is None or active.thread != threading.get_ident():
+        return nullcontext()
+    return active.stage(name)
@@ -0,0 +1,117 @@
+"""
+Lazy, per-process spaCy model loading.
+
+Nothing here imports spaCy until load_model() is first called.  Loaded
+pipelines get the gazetteer component (extractor.gazetteer) for the given
+stoplists and are cached per (model, vectors, stoplists) so every caller in
+the process shares one copy, and the time spent importing spaCy and loading each model
+is kept in LOAD_TIMES for cold-start reporting.
+
+"distilled" names the small NER model that distill.py trains from the
+extractor's own output; it has no word vectors and loads in a fraction of
+en_core_web_lg's time.
+"""
+
+import json
+import os
+import time
+
+from .gazetteer import add_gazetteer
+from .metrics import timed
+from .validators import DEFAULT_STOPLISTS
+
+DISTILLED_MODEL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "models", "leads_ner")
+
+MODEL_SIZES = {
+    "sm": "en_core_web_sm",
+    "md": "en_core_web_md",
+    "lg": "en_core_web_lg",
+    "distilled": DISTILLED_MODEL,
+}
+DEFAULT_MODEL = "lg"
+
+# Components the extractor never reads; excluded at load time rather than disabled
+UNUSED_PIPES = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+LOAD_TIMES = {}
+_models = {}
+
+
+def model_name(model: str = DEFAULT_MODEL) -> str:
+    """Resolve a size alias (sm/md/lg) to a package name; names and paths pass through."""
+    return MODEL_SIZES.get(model, model)
+
+
+def model_id(model: str = DEFAULT_MODEL) -> str:
+    """
+    model_name(), plus the version from meta.json for models loaded from a
+    directory, so retraining a local model invalidates cached results.
+    """
+    name = model_name(model)
+    try:
+        with open(os.path.join(name, "meta.json"), encoding="utf8") as fh:
+            return f"{name}@{json.load(fh)['version']}"
+    except (OSError, ValueError, KeyError):
+        return name
+
+
+def uses_static_vectors(nlp) -> bool:
+    """True if any remaining component is configured to read static vectors."""
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get("include_static_vectors"):
+                return True
+            return any(walk(v) for v in node.values())
+        return False
+    return any(walk(nlp.config["components"].get(name, {})) for name in nlp.pipe_names)
+
+
+def load_model(model: str = DEFAULT_MODEL, vectors: bool = False, stoplists=DEFAULT_STOPLISTS):
+    """
+    Return the spaCy pipeline for `model`, loading it on first use, with
+    `stoplists` compiled into its gazetteer component.
+
+    Static word vectors are dropped after loading unless `vectors` is set or
+    a remaining component was trained with them (as en_core_web_md/lg are).
+    """
+    name = model_name(model)
+    key = (name, vectors, stoplists)
+    if key in _models:
+        return _models[key]
+    with timed("load_model"):
+        _models[key] = add_gazetteer(_load(name, vectors), stoplists)
+    return _models[key]
+
+
+def _load(name: str, vectors: bool):
+    t0 = time.perf_counter()
+    try:
+        import spacy
+    except ImportError:
+        raise ImportError("Please install spaCy: pip install spacy")
+    LOAD_TIMES.setdefault("import_spacy", time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    try:
+        nlp = spacy.load(name, exclude=UNUSED_PIPES)
+    except OSError:
+        if name == DISTILLED_MODEL:
+            raise OSError(f"No distilled model at {name}; train one with distill.py")
+        raise OSError(f"Please download the spaCy model: python -m spacy download {name}")
+    if not vectors and nlp.vocab.vectors.shape[0] and not uses_static_vectors(nlp):
+        nlp.vocab.reset_vectors(width=0)
+    LOAD_TIMES[name] = time.perf_counter() - t0
+    return nlp
+
+
+def prune_vectors(nlp, rows: int):
+    """
+    Shrink the static vectors table to its `rows` most frequent entries in
+    place; every other word is remapped to its nearest remaining vector.
+    Cuts en_core_web_lg's vectors from ~500k rows to `rows` at a small
+    accuracy cost, and is slow once (nearest-neighbour search) per load.
+    """
+    if nlp.vocab.vectors.shape[0] > rows:
+        nlp.vocab.prune_vectors(rows)
+    return nlp
@@ -0,0 +1,166 @@
+"""
+Buffered record writers for CSV, JSONL and Parquet.
+
+    with open_output("parquet", fields, "leads_with_context") as out:
+        out.write(records)
+
+CSV goes to a single BASE.csv as before.  JSONL and Parquet are
+partitioned per run, hive-style, as BASE/EXT/run=RUN_ID/part-NNNNN.EXT, so
+repeated runs never overwrite each other and BASE/EXT can be loaded as one
+dataset (pyarrow.dataset / pandas / DuckDB pick `run` up as a column).
+Rows are buffered and written in batches; Parquet stores file/type (and
+duplicate_of) dictionary-encoded, so repeated file names cost a few bytes
+per row instead of the full string.
+"""
+
+import csv
+import json
+import os
+import time
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+BUFFER_ROWS = 10_000      # rows held before each batch write
+PART_ROWS = 1_000_000     # rows per JSONL/Parquet part file
+DICTIONARY_FIELDS = frozenset({"file", "type", "duplicate_of"})
+INTEGER_FIELDS = frozenset({"mentions"})
+
+
+def default_run_id() -> str:
+    return time.strftime("%Y%m%dT%H%M%S")
+
+
+class _BufferedWriter:
+    def __init__(self, fields: list[str]):
+        self.fields = fields
+        self.buffer = []
+        self.rows = 0
+
+    def write(self, records):
+        self.buffer.extend(records)
+        if len(self.buffer) >= BUFFER_ROWS:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self._write_batch(self.buffer)
+            self.rows += len(self.buffer)
+            self.buffer = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CSVOutput(_BufferedWriter):
+    def __init__(self, fields: list[str], base: str):
+        super().__init__(fields)
+        self.path = base + ".csv"
+        self.fh = open(self.path, "w", newline="", encoding="utf8")
+        self.writer = csv.DictWriter(self.fh, fieldnames=fields)
+        self.writer.writeheader()
+
+    def _write_batch(self, batch):
+        self.writer.writerows(batch)
+
+    def close(self):
+        super().close()
+        self.fh.close()
+
+
+class _PartitionedOutput(_BufferedWriter):
+    ext = ""
+
+    def __init__(self, fields: list[str], base: str, run_id: str | None = None):
+        super().__init__(fields)
+        self.path = os.path.join(base, self.ext, f"run={run_id or default_run_id()}")
+        os.makedirs(self.path, exist_ok=True)
+        self.part = -1
+        self.part_rows = PART_ROWS
+
+    def _write_batch(self, batch):
+        while batch:
+            if self.part_rows >= PART_ROWS:
+                self._close_part()
+                self.part += 1
+                self.part_rows = 0
+                self._open_part(os.path.join(self.path, f"part-{self.part:05d}.{self.ext}"))
+            take = PART_ROWS - self.part_rows
+            self._write_part(batch[:take])
+            self.part_rows += len(batch[:take])
+            batch = batch[take:]
+
+    def close(self):
+        super().close()
+        self._close_part()
+
+
+class JSONLOutput(_PartitionedOutput):
+    ext = "jsonl"
+    fh = None
+
+    def _open_part(self, path):
+        self.fh = open(path, "w", encoding="utf8")
+
+    def _write_part(self, batch):
+        self.fh.write("".join(json.dumps({f: r.get(f) for f in self.fields}, ensure_ascii=False) + "\n"
+                              for r in batch))
+
+    def _close_part(self):
+        if self.fh:
+            self.fh.close()
+            self.fh = None
+
+
+class ParquetOutput(_PartitionedOutput):
+    ext = "parquet"
+    writer = None
+
+    def __init__(self, fields: list[str], base: str, run_id: str | None = None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+        self.pa, self.pq = pa, pq
+        self.schema = pa.schema([
+            (f, pa.int64() if f in INTEGER_FIELDS
+             else pa.dictionary(pa.int32(), pa.string()) if f in DICTIONARY_FIELDS
+             else pa.string())
+            for f in fields
+        ])
+        super().__init__(fields, base, run_id)
+
+    def _open_part(self, path):
+        self.writer = self.pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def _write_part(self, batch):
+        columns = [
+            self.pa.array([r.get(f) for r in batch],
+                          type=self.pa.int64() if f in INTEGER_FIELDS else self.pa.string())
+            for f in self.fields
+        ]
+        columns = [col.dictionary_encode() if f in DICTIONARY_FIELDS else col
+                   for f, col in zip(self.fields, columns)]
+        self.writer.write_table(self.pa.Table.from_arrays(columns, schema=self.schema))
+
+    def _close_part(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+
+def open_output(fmt: str, fields: list[str], base: str, run_id: str | None = None):
+    """Writer for `fmt` (one of FORMATS) with write(records) / close()."""
+    if fmt == "csv":
+        return CSVOutput(fields, base)
+    if fmt == "jsonl":
+        return JSONLOutput(fields, base, run_id)
+    if fmt == "parquet":
+        return ParquetOutput(fields, base, run_id)
+    raise ValueError(f"Unknown output format {fmt!r}; expected one of {FORMATS}")
@@ -0,0 +1,87 @@
+"""
+Single-pass phone number extraction.
+
+All candidate formats are folded into one compiled alternation, raw
+candidates are reduced to their digits before parsing, and parse/validate
+results are memoized in a bounded LRU cache shared by every document in
+the process.  The alternation is greedy, so a candidate that swallowed
+trailing digits ("+1 800 555 0199 24 hours") and fails validation is
+retried with its trailing digit groups dropped.
+"""
+
+import re
+from functools import lru_cache
+
+try:
+    import phonenumbers
+except ImportError:
+    raise ImportError("Please install python-phonenumbers: pip install phonenumbers")
+
+REGIONS = ("US", "IN", "GB", "CA", "AU")
+PARSE_CACHE_SIZE = 65536
+
+PHONE_RE = re.compile("|".join([
+    r'\+91[-.\s]?\d{10}',                                                      # India
+    r'\+\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}(?:[-.\s]?\d{1,4})?',  # International
+    r'\(\d{3}\)[-.\s]?\d{3}[-.\s]?\d{4}',                                      # (123) 456-7890
+    r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',                                      # 123-456-7890 / 1234567890
+]))
+NON_DIGIT = re.compile(r'\D')
+DIGIT_RUN = re.compile(r'\d+')
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_candidate(key: str) -> str | None:
+    """
+    Validate a normalized candidate ("+" prefix if present, then digits)
+    and return it in international format, or None.
+    """
+    regions = (None,) if key.startswith("+") else REGIONS
+    for region in regions:
+        try:
+            num = phonenumbers.parse(key, region)
+        except phonenumbers.NumberParseException:
+            continue
+        if phonenumbers.is_valid_number(num):
+            return phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+    return None
+
+
+def candidate_key(raw: str) -> str | None:
+    """Normalized parse key for a raw candidate, or None if it has the wrong length."""
+    digits = NON_DIGIT.sub("", raw)
+    if not (7 <= len(digits) <= 15):
+        return None
+    return "+" + digits if raw.startswith("+") else digits
+
+
+def match_phone(raw: str) -> tuple[str, int] | None:
+    """
+    (formatted, length) for the longest valid prefix of a raw candidate
+    that ends at a digit group boundary, or None.
+    """
+    ends = [m.end() for m in DIGIT_RUN.finditer(raw)]
+    for end in reversed(ends):
+        key = candidate_key(raw[:end])
+        formatted = key and parse_candidate(key)
+        if formatted:
+            return formatted, end
+    return None
+
+
+def find_phone_numbers(text: str) -> list[tuple[str, int, int]]:
+    """Return (formatted, start, end) for every valid phone mention in text."""
+    matches = {}
+    found = []
+    for m in PHONE_RE.finditer(text):
+        raw = m.group()
+        if raw not in matches:
+            matches[raw] = match_phone(raw)
+        if matches[raw]:
+            formatted, length = matches[raw]
+            found.append((formatted, m.start(), m.start() + length))
+    return found
+
+
+def extract_phone_numbers(text: str) -> list[str]:
+    return sorted({phone for phone, _, _ in find_phone_numbers(text)})
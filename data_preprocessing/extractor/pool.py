@@ -0,0 +1,117 @@
+"""
+Fork-based worker pool that shares one loaded model between processes.
+
+The parent loads the pipeline, runs a full collection and gc.freeze()s
+every object into the permanent generation before forking, so the
+children's garbage collector never writes to (and un-shares) the pages
+holding the model's weights and vectors.  Workers then inherit the
+pipeline copy-on-write instead of each loading their own copy:
+
+    with ForkPool(4, model="lg") as pool:
+        for name, records in pool.extract(pairs):
+            ...
+    pool.memory  # {pid: {"rss_mb", "pss_mb", "private_mb"}}
+
+PSS (proportional set size) splits shared pages between the processes
+using them, so summing pss_mb over the parent and the workers gives the
+real footprint of the pool.  Linux only (fork + /proc).
+"""
+
+import gc
+import multiprocessing
+import os
+import resource
+from itertools import islice
+
+from .core import MODES, extract_many
+from .model import DEFAULT_MODEL, load_model
+from .validators import DEFAULT_STOPLISTS
+
+# Re-read a worker's memory every this many batches; smaps_rollup is not free
+MEMORY_EVERY = 20
+
+_options = {}
+
+
+def process_memory() -> dict[str, float]:
+    """RSS, PSS and private (USS) memory of this process in MB."""
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            for line in fh:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                    fields[key] = int(rest.split()[0]) / 1024
+    except OSError:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return {"rss_mb": round(rss, 1), "pss_mb": None, "private_mb": None}
+    return {
+        "rss_mb": round(fields["Rss"], 1),
+        "pss_mb": round(fields["Pss"], 1),
+        "private_mb": round(fields["Private_Clean"] + fields["Private_Dirty"], 1),
+    }
+
+
+def _run_batch(batch):
+    """Worker side: extract one batch with the inherited pipeline."""
+    _options["batches"] = _options.get("batches", 0) + 1
+    decisions = {}
+    results = list(extract_many(batch, n_process=1, decisions=decisions, **_options["extract"]))
+    memory = process_memory() if _options["batches"] % MEMORY_EVERY == 1 else None
+    return results, decisions, os.getpid(), memory
+
+
+def _final_memory(_):
+    return os.getpid(), process_memory()
+
+
+def _batches(items, size):
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+class ForkPool:
+    def __init__(self, workers: int, mode: str = "full", model: str = DEFAULT_MODEL,
+                 batch_size: int = 16, all_mentions: bool = False, stoplists=DEFAULT_STOPLISTS,
+                 gate: bool = False):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+        self.workers = workers
+        self.batch_size = batch_size
+        self.memory = {}
+        _options["extract"] = dict(mode=mode, model=model, batch_size=batch_size,
+                                   all_mentions=all_mentions, stoplists=stoplists, gate=gate)
+        if mode != "contacts":
+            load_model(model, stoplists=stoplists)
+        gc.collect()
+        gc.freeze()
+        self.pool = multiprocessing.get_context("fork").Pool(workers)
+
+    def extract(self, items, decisions: dict | None = None):
+        """
+        Yield (name, records) for (text, name) pairs, in input order.  Gate
+        decisions made in the workers are copied into `decisions`.
+        """
+        for results, gated, pid, memory in self.pool.imap(_run_batch, _batches(items, self.batch_size)):
+            if memory:
+                self.memory[pid] = memory
+            if decisions is not None:
+                decisions.update(gated)
+            yield from results
+
+    def close(self):
+        # One probe per worker is not guaranteed to reach every worker, so
+        # send a few and keep the latest reading per pid
+        for pid, memory in self.pool.map(_final_memory, range(self.workers * 4), chunksize=1):
+            self.memory[pid] = memory
+        self.memory["parent"] = process_memory()
+        self.pool.close()
+        self.pool.join()
+        gc.unfreeze()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,203 @@
+"""
+Long-running local extraction service.
+
+Keeps the spaCy model warm in one process so callers (main.js, scripts)
+don't pay the model load on every run.  Requests from concurrent clients
+are queued and coalesced into nlp.pipe batches by a fixed pool of batch
+workers; the queue is bounded and a full queue answers 503.  The workers
+share one pipeline and take turns on it (spaCy makes no thread-safety
+promise, and the GIL would serialise them anyway), so extra workers only
+overlap contacts-only batches and batch collection with NER.
+
+    python -m extractor.service --port 8765 --workers 2
+
+Endpoints (JSON, localhost only):
+
+    GET  /health   -> {"status": "ok", "model": ..., "queued": n}
+    POST /extract  {"documents": [...], "mode": "full", "all_mentions": false}
+                   -> {"results": [{"id": ..., "url": ..., "records": [...]}]}
+
+A document is either {"id", "text"} or a SmartLeadGenerator.deepScrape()
+result ({"title", "meta", "content", ...}); "url" is echoed back if given.
+"""
+
+import argparse
+import ipaddress
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .core import MODES, extract_many
+from .model import DEFAULT_MODEL, load_model, model_name
+from .sources import document_text
+
+DEFAULT_PORT = 8765
+
+
+class Batcher:
+    """
+    Bounded work queue drained by `workers` threads. Each worker takes up to
+    batch_size queued documents (waiting at most max_wait seconds for the
+    batch to fill) and runs them through extract_many in one nlp.pipe call.
+    NER batches hold `nlp_lock`, so only one worker uses the pipeline at a time.
+    """
+
+    def __init__(self, model: str = DEFAULT_MODEL, workers: int = 1, batch_size: int = 16,
+                 max_wait: float = 0.05, max_queue: int = 1024):
+        self.model = model
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.nlp_lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._run, name=f"extract-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self.threads:
+            t.start()
+
+    def submit(self, text: str, name: str, mode: str, all_mentions: bool) -> Future:
+        """Queue one document; raises queue.Full when the service is saturated."""
+        fut = Future()
+        self.queue.put_nowait((text, name, mode, all_mentions, fut))
+        return fut
+
+    def _take_batch(self) -> list:
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            groups = {}
+            for item in batch:
+                groups.setdefault((item[2], item[3]), []).append(item)
+            for (mode, all_mentions), items in groups.items():
+                try:
+                    with self.nlp_lock if mode != "contacts" else nullcontext():
+                        results = list(extract_many(
+                            ((text, name) for text, name, *_ in items),
+                            mode=mode, model=self.model, batch_size=self.batch_size,
+                            all_mentions=all_mentions,
+                        ))
+                    for item, (_, records) in zip(items, results):
+                        item[4].set_result(records)
+                except Exception as e:
+                    for item in items:
+                        if not item[4].done():
+                            item[4].set_exception(e)
+
+
+def checked_text(doc, i: int) -> str:
+    """Text of request document i; ValueError unless it is an object with a string text or content."""
+    if not isinstance(doc, dict):
+        raise ValueError(f"document {i} is not an object")
+    if not isinstance(doc.get("text", doc.get("content")), str):
+        raise ValueError(f"document {i} needs a string 'text' or 'content'")
+    return document_text(doc)
+
+
+class ExtractionHandler(BaseHTTPRequestHandler):
+    batcher: Batcher = None
+    timeout_s: float = 300.0
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send(404, {"error": "not found"})
+        self._send(200, {
+            "status": "ok",
+            "model": model_name(self.batcher.model),
+            "queued": self.batcher.queue.qsize(),
+        })
+
+    def do_POST(self):
+        if self.path != "/extract":
+            return self._send(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            req = json.loads(self.rfile.read(length) or b"{}")
+            docs = req["documents"]
+            mode = req.get("mode", "full")
+            all_mentions = req.get("all_mentions", False)
+            if mode not in MODES:
+                raise ValueError(f"unknown mode {mode!r}")
+            if not isinstance(all_mentions, bool):
+                raise ValueError("all_mentions must be true or false")
+            if not isinstance(docs, list):
+                raise ValueError("documents must be a list")
+            texts = [checked_text(d, i) for i, d in enumerate(docs)]
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            return self._send(400, {"error": f"bad request: {e}"})
+
+        try:
+            futures = [
+                self.batcher.submit(text, str(d.get("id", i)), mode, all_mentions)
+                for i, (d, text) in enumerate(zip(docs, texts))
+            ]
+        except queue.Full:
+            return self._send(503, {"error": "extraction queue is full, retry later"})
+
+        try:
+            results = [
+                {"id": str(d.get("id", i)), "url": d.get("url"), "records": f.result(self.timeout_s)}
+                for i, (d, f) in enumerate(zip(docs, futures))
+            ]
+        except Exception as e:
+            return self._send(500, {"error": str(e)})
+        self._send(200, {"results": results})
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, model: str = DEFAULT_MODEL,
+          workers: int = 1, batch_size: int = 16, max_queue: int = 1024):
+    if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+        raise ValueError(f"Refusing to bind extraction service to non-loopback address {host}")
+
+    print(f"Loading {model_name(model)}…")
+    load_model(model)
+    ExtractionHandler.batcher = Batcher(model, workers, batch_size, max_queue=max_queue)
+    server = ThreadingHTTPServer((host, port), ExtractionHandler)
+    print(f"Extraction service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Serve lead extraction over HTTP on localhost")
+    p.add_argument("--host", default="127.0.0.1", help="Loopback address to bind")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--model", default=DEFAULT_MODEL, help="spaCy model size or name")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Batch worker threads; they share one pipeline, so this adds "
+                        "concurrency (contacts-only batches, batch collection), not parallel NER")
+    p.add_argument("--batch-size", type=int, default=16, help="Max documents per nlp.pipe batch")
+    p.add_argument("--max-queue", type=int, default=1024, help="Max queued documents before 503")
+    args = p.parse_args()
+    serve(args.host, args.port, args.model, args.workers, args.batch_size, args.max_queue)
@@ -0,0 +1,108 @@
+"""
+Readers for the scraper's own outputs, so extraction can skip the
+clean.js -> cleaned_data/*.txt round trip.
+
+    txt    cleaned_data/*.txt as written by clean.js (read as-is)
+    leads  detailed_leads/*.json written by SmartLeadGenerator.processDeepScraping
+    raw    deepscrape/*.txt|*.html pages with URL:/PLATFORM:/SCRAPED: headers
+
+leads and raw documents are cleaned with clean_text(), which applies
+clean.js's precompiled removal patterns in its order and with its
+JavaScript regex semantics, and carry their source URL and platform along
+as metadata.
+"""
+
+import glob
+import json
+import os
+import re
+
+INPUT_FORMATS = ("txt", "leads", "raw")
+SOURCE_FIELDS = ["source_url", "platform"]
+
+GLOBS = {
+    "txt": ("*.txt",),
+    "leads": ("*.json",),
+    "raw": ("*.txt", "*.html"),
+}
+
+# clean.js's unwantedPatterns, applied one after another in its order (a
+# later pattern can match text that an earlier removal joined together)
+# with JavaScript semantics: ASCII \w, \d and \b, "." stopping at any JS
+# line terminator, and JS's set of whitespace characters.  A bare "X" is
+# removed wherever it appears, as in clean.js.
+JS_SPACE = r"\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff"
+JS_DOT = r"[^\n\r\u2028\u2029]"
+BOILERPLATE = tuple(re.compile(pattern, re.ASCII) for pattern in [
+    rf'URL:{JS_DOT}+',
+    rf'PLATFORM:{JS_DOT}+',
+    rf'SCRAPED:{JS_DOT}+',
+    r'Reviews',
+    r'Ratings',
+    r'Service Lines',
+    r'Project cost',
+    r'Service Provided',
+    r'Showing \d+-\d+ of \d+ Reviews',
+    r'Background',
+    r'Opportunity',
+    r'Solution',
+    r'Results & Feedback',
+    r'Portfolio & Awards',
+    r'Location',
+    r'Contact',
+    r'LinkedIn|Facebook|X|Instagram',
+    r'Location',
+    r'\d{2}-\d{2}-\d{4}',
+    rf'\b(?:min|max)\b[\w{JS_SPACE}]+',
+])
+WHITESPACE = re.compile(f'[{JS_SPACE}]+')
+HEADER = re.compile(r'^(URL|PLATFORM):[ \t]*(.+?)[ \t]*$', re.MULTILINE)
+
+
+def clean_text(data: str) -> str:
+    """clean.js's cleanData(): drop boilerplate, then collapse to one line."""
+    for pattern in BOILERPLATE:
+        data = pattern.sub("", data)
+    return WHITESPACE.sub(" ", data).strip(" ")
+
+
+def document_text(doc: dict) -> str:
+    """Plain text of a request document (raw text or deepScrape output)."""
+    if "text" in doc:
+        return doc["text"]
+    meta = doc.get("meta") or {}
+    parts = [doc.get("title", ""), meta.get("description", ""), doc.get("content", "")]
+    return "\n".join(p for p in parts if p)
+
+
+def list_documents(directory: str, fmt: str = "txt") -> list[str]:
+    """Sorted input paths of the given format in directory."""
+    if fmt not in GLOBS:
+        raise ValueError(f"Unknown input format {fmt!r}; expected one of {INPUT_FORMATS}")
+    return sorted({p for pattern in GLOBS[fmt] for p in glob.glob(os.path.join(directory, pattern))})
+
+
+def read_document(path: str, fmt: str = "txt") -> tuple[str, dict]:
+    """(text to extract from, source metadata) for one input file."""
+    with open(path, encoding="utf8", errors="ignore") as fh:
+        data = fh.read()
+    if fmt == "txt":
+        return data, {}
+
+    if fmt == "leads":
+        try:
+            lead = json.loads(data)
+            if not isinstance(lead, dict):
+                raise ValueError("not a JSON object")
+        except ValueError as e:  # json.JSONDecodeError is a ValueError
+            print(f"Error reading {path}: {e}")
+            return "", {"source_url": "", "platform": ""}
+        scraped = lead.get("scrapedData") or {}
+        platform = (scraped.get("platformData") or {}).get("type") \
+            or ((lead.get("leadInfo") or {}).get("raw_data") or {}).get("platform") or "website"
+        meta = {"source_url": (lead.get("source") or {}).get("url", ""), "platform": platform}
+        return clean_text(document_text(scraped)), meta
+
+    headers = dict(HEADER.findall(data[:4096]))
+    meta = {"source_url": headers.get("URL", ""), "platform": headers.get("PLATFORM", "")}
+    return clean_text(data), meta
@@ -0,0 +1,162 @@
+"""
+Constant-memory summary statistics for long extraction runs.
+
+StreamingCounter counts exactly while it has seen at most `threshold`
+distinct keys.  Past that it switches to sketches: a HyperLogLog for the
+number of distinct keys (~0.8% standard error at the default precision) and
+a Count-Min sketch feeding a fixed-size top-K table for the heavy hitters.
+Either way its memory is bounded by the threshold plus a few hundred KB.
+
+StreamingSummary keeps one StreamingCounter per entity type plus per-type
+totals, which is all nlp.py needs for its end-of-run report.
+"""
+
+import hashlib
+import math
+from array import array
+from collections import Counter
+
+from .index import normalize_entity
+
+DEFAULT_THRESHOLD = 10_000
+DEFAULT_TOP_K = 10
+
+
+def _hash64(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = 14):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self.alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add(self, key: str):
+        h = _hash64(key)
+        idx = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def count(self) -> int:
+        estimate = self.alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Small-range correction: linear counting
+            estimate = self.m * math.log(self.m / zeros)
+        return round(estimate)
+
+
+class CountMinSketch:
+    def __init__(self, width: int = 4096, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def _cells(self, key: str):
+        h = _hash64(key)
+        h1, h2 = h & 0xFFFFFFFF, h >> 32 | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add count to key and return its new estimate."""
+        estimate = None
+        for row, cell in zip(self.rows, self._cells(key)):
+            row[cell] += count
+            estimate = row[cell] if estimate is None else min(estimate, row[cell])
+        return estimate
+
+
+class StreamingCounter:
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, top_k: int = DEFAULT_TOP_K):
+        self.threshold = threshold
+        self.top_k = top_k
+        self.total = 0
+        self.exact = Counter()
+        self.labels = {}      # key -> display form, for exact keys / top-K entries only
+        self.hll = None
+        self.cms = None
+        self.top = {}         # key -> estimated count, sketch mode only
+
+    @property
+    def is_exact(self) -> bool:
+        return self.hll is None
+
+    def add(self, key: str, label: str | None = None, count: int = 1):
+        self.total += count
+        if self.is_exact:
+            if key not in self.exact:
+                self.labels[key] = label or key
+            self.exact[key] += count
+            if len(self.exact) > self.threshold:
+                self._switch_to_sketches()
+            return
+        self.hll.add(key)
+        self._offer(key, label, self.cms.add(key, count))
+
+    def _switch_to_sketches(self):
+        self.hll, self.cms = HyperLogLog(), CountMinSketch()
+        exact, labels = self.exact, self.labels
+        self.exact, self.labels = Counter(), {}
+        for key, n in exact.items():
+            self.hll.add(key)
+            self.cms.add(key, n)
+        for key, n in exact.most_common(self.top_k):
+            self.top[key] = n
+            self.labels[key] = labels[key]
+
+    def _offer(self, key: str, label: str | None, estimate: int):
+        if key in self.top or len(self.top) < self.top_k:
+            self.top[key] = estimate
+            self.labels.setdefault(key, label or key)
+            return
+        floor = min(self.top, key=self.top.get)
+        if estimate > self.top[floor]:
+            del self.top[floor]
+            del self.labels[floor]
+            self.top[key] = estimate
+            self.labels[key] = label or key
+
+    def distinct(self) -> int:
+        return len(self.exact) if self.is_exact else self.hll.count()
+
+    def most_common(self, n: int | None = None) -> list[tuple[str, int]]:
+        """(display form, count) pairs, highest first; counts are upper bounds in sketch mode."""
+        n = self.top_k if n is None else n
+        items = self.exact.most_common(n) if self.is_exact else sorted(
+            self.top.items(), key=lambda kv: -kv[1])[:n]
+        return [(self.labels[key], count) for key, count in items]
+
+
+class StreamingSummary:
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, top_k: int = DEFAULT_TOP_K):
+        self.threshold = threshold
+        self.top_k = top_k
+        self.files = 0
+        self.counters = {}
+
+    def add_file(self, entities: dict[str, list[str]]):
+        """Fold in one file's entities, given as {type: [entity, ...]}."""
+        self.files += 1
+        for kind, values in entities.items():
+            counter = self.counters.get(kind)
+            if counter is None:
+                counter = self.counters[kind] = StreamingCounter(self.threshold, self.top_k)
+            for value in values:
+                counter.add(normalize_entity(kind, value), value)
+
+    def counter(self, kind: str) -> StreamingCounter:
+        return self.counters.get(kind) or StreamingCounter(self.threshold, self.top_k)
+
+    def distinct(self, kind: str) -> int:
+        return self.counter(kind).distinct()
+
+    def average(self, kind: str) -> float:
+        """Mean number of entities of this type per file."""
+        return self.counter(kind).total / self.files if self.files else 0.0
+
+    def top(self, kind: str, n: int | None = None) -> list[tuple[str, int]]:
+        return self.counter(kind).most_common(n)
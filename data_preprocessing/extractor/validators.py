@@ -0,0 +1,237 @@
+"""
+Table-driven validation of PERSON / ORG entities.
+
+Stoplists are module-level frozensets and every rule family is a single
+precompiled alternation, so validating a candidate is a handful of set
+lookups and regex scans.  validate_batch() filters a whole document's
+entities at once and decides each distinct (label, text) pair only once.
+
+Extra stoplist entries can be loaded from a JSON or YAML file:
+
+    {"person": ["..."], "organization": ["..."], "business_terms": ["..."],
+     "companies": ["..."], "platforms": ["..."]}
+
+or, for lists with tens of thousands of entries, from a directory holding
+any of person.txt, organization.txt, business_terms.txt, companies.txt and
+platforms.txt with one entry per line ('#' starts a comment).  companies
+and platforms are gazetteers used by extractor.gazetteer inside the spaCy
+pipeline.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+PERSON_FALSE_POSITIVES = frozenset({
+    'linkedin', 'facebook', 'twitter', 'instagram', 'youtube', 'google',
+    'microsoft', 'apple', 'amazon', 'tesla', 'nike', 'adidas',
+    'web developer', 'software engineer', 'data scientist', 'product manager',
+    'marketing', 'sales', 'customer success', 'business development',
+    'artificial intelligence', 'machine learning', 'deep learning',
+    'university', 'college', 'school', 'company', 'corporation',
+    'inc', 'llc', 'ltd', 'pvt', 'technologies', 'solutions', 'services',
+    'consulting', 'management', 'development', 'systems', 'software',
+    'mobile app', 'web app', 'saas', 'b2b', 'api', 'cloud computing',
+    'big data', 'analytics', 'blockchain', 'cybersecurity', 'fintech',
+    'healthtech', 'edtech', 'proptech', 'insurtech', 'regtech',
+    'click here', 'learn more', 'read more', 'contact us', 'about us',
+    'privacy policy', 'terms of service', 'cookie policy',
+})
+
+ORG_FALSE_POSITIVES = frozenset({
+    'linkedin', 'facebook', 'twitter', 'instagram', 'youtube',
+    'click here', 'learn more', 'read more', 'contact us', 'about us',
+    'privacy policy', 'terms of service', 'cookie policy',
+    'web developer', 'software engineer', 'data scientist',
+    'artificial intelligence', 'machine learning', 'deep learning',
+    'mobile app development', 'web development', 'app development',
+    'digital marketing', 'social media marketing', 'content marketing',
+    'search engine optimization', 'seo', 'sem', 'ppc', 'cpc',
+    'user experience', 'user interface', 'ux', 'ui', 'ux/ui',
+    'information technology', 'computer software', 'software development',
+    'cloud computing', 'big data', 'data analytics', 'business analytics',
+    'custom software development', 'mobile application development',
+    'e-commerce development', 'website development', 'web design',
+    'jobs engineering', 'jobs marketing', 'jobs sales', 'jobs designer',
+    'actively hiring', 'hiring', 'recruitment', 'staffing',
+    'remote work', 'work from home', 'freelance', 'contract',
+})
+
+# Sites the corpus is scraped from; mentions of them are never leads
+PLATFORMS = frozenset({
+    'linkedin', 'facebook', 'twitter', 'x.com', 'instagram', 'youtube', 'tiktok',
+    'github', 'gitlab', 'bitbucket', 'stack overflow', 'stackoverflow',
+    'hacker news', 'y combinator news', 'reddit', 'medium', 'substack', 'dev.to',
+    'product hunt', 'crunchbase', 'angellist', 'wellfound', 'glassdoor', 'indeed',
+    'archive.org', 'wayback machine', 'discord', 'slack', 'telegram', 'whatsapp',
+})
+
+BUSINESS_TERMS = frozenset({
+    'ceo', 'cto', 'cfo', 'coo', 'vp', 'director', 'manager',
+    'lead', 'senior', 'junior', 'intern', 'consultant',
+    'analyst', 'specialist', 'expert', 'advisor', 'founder',
+    'co-founder', 'entrepreneur', 'investor', 'partner',
+})
+
+HAS_LETTER = re.compile(r'[a-zA-Z]')
+DIGIT = re.compile(r'\d')
+# Anything other than letters, digits, space, '.', '-' and "'"
+SPECIAL_CHAR = re.compile(r"[^\w .'-]|_")
+PERSON_URLISH = re.compile(r'@|http|\.com|\.org')
+ORG_URLISH = re.compile(r'@|http')
+JOB_TITLE = re.compile(
+    r'\b(?:ceo|cto|cfo|coo|vp|director|manager|lead|senior|junior'
+    r'|marketing|sales|engineering|development|design|hr|finance'
+    r'|team|department|division|unit|group)\b'
+)
+
+
+def _alternation(terms) -> re.Pattern:
+    # Longest first so overlapping terms ("co-founder"/"founder") both match
+    return re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)))
+
+
+LIST_NAMES = ("person", "organization", "business_terms", "companies", "platforms")
+
+
+class Stoplists:
+    """
+    Immutable bundle of stoplists and gazetteers plus their compiled patterns.
+    Instances hash by identity, so one can key a cached pipeline.
+    """
+
+    def __init__(self, person=PERSON_FALSE_POSITIVES, organization=ORG_FALSE_POSITIVES,
+                 business_terms=BUSINESS_TERMS, companies=(), platforms=PLATFORMS):
+        self.person = frozenset(t.lower() for t in person)
+        self.organization = frozenset(t.lower() for t in organization)
+        self.business_terms = frozenset(t.lower() for t in business_terms)
+        self.companies = frozenset(t.lower() for t in companies)
+        self.platforms = frozenset(t.lower() for t in platforms)
+        self.business_re = _alternation(self.business_terms)
+
+    @property
+    def digest(self) -> str:
+        """Content hash, for cache keys."""
+        h = hashlib.sha256()
+        for name in LIST_NAMES:
+            h.update(name.encode())
+            for term in sorted(getattr(self, name)):
+                h.update(b"\0" + term.encode())
+        return h.hexdigest()
+
+
+DEFAULT_STOPLISTS = Stoplists()
+
+
+def _read_lines(path: str) -> list[str]:
+    with open(path, encoding="utf8") as fh:
+        return [t for t in (line.split("#", 1)[0].strip() for line in fh) if t]
+
+
+def load_stoplists(path: str) -> Stoplists:
+    """Extend the default stoplists with entries from a JSON/YAML file or a directory of .txt lists."""
+    if os.path.isdir(path):
+        data = {}
+        for name in LIST_NAMES:
+            list_path = os.path.join(path, name + ".txt")
+            if os.path.exists(list_path):
+                data[name] = _read_lines(list_path)
+        return _extend_defaults(data)
+
+    with open(path, encoding="utf8") as fh:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Please install PyYAML to read YAML stoplists: pip install pyyaml")
+            data = yaml.safe_load(fh) or {}
+        else:
+            data = json.load(fh)
+    return _extend_defaults(data)
+
+
+def _extend_defaults(data: dict) -> Stoplists:
+    return Stoplists(
+        person=PERSON_FALSE_POSITIVES | set(data.get("person", ())),
+        organization=ORG_FALSE_POSITIVES | set(data.get("organization", ())),
+        business_terms=BUSINESS_TERMS | set(data.get("business_terms", ())),
+        companies=set(data.get("companies", ())),
+        platforms=PLATFORMS | set(data.get("platforms", ())),
+    )
+
+
+def is_valid_person_name(name, stoplists=DEFAULT_STOPLISTS):
+    """Enhanced validation for person names"""
+    name = name.strip()
+    if len(name) < 2 or len(name) > 50:
+        return False
+    if not HAS_LETTER.search(name):
+        return False
+    if len(DIGIT.findall(name)) > len(name) * 0.3:
+        return False
+
+    name_lower = name.lower()
+    if name_lower in stoplists.person:
+        return False
+
+    if stoplists.business_re.search(name_lower):
+        # Allow if it's likely a real name with title (e.g., "CEO John Smith")
+        words = name_lower.split()
+        return len(words) >= 2 and any(w not in stoplists.business_terms for w in words)
+
+    if PERSON_URLISH.search(name):
+        return False
+    if len(SPECIAL_CHAR.findall(name)) > 3:
+        return False
+    # All caps and longer than 4 characters is likely an acronym
+    if name.isupper() and len(name) > 4:
+        return False
+    return True
+
+
+def is_valid_organization(org, stoplists=DEFAULT_STOPLISTS):
+    """Enhanced validation for organization names"""
+    org = org.strip()
+    if len(org) < 2 or len(org) > 100:
+        return False
+    if not HAS_LETTER.search(org):
+        return False
+    if len(DIGIT.findall(org)) > len(org) * 0.5:
+        return False
+
+    org_lower = org.lower()
+    if org_lower in stoplists.organization:
+        return False
+    if ORG_URLISH.search(org):
+        return False
+    # Just a job title or department
+    if len(org.split()) <= 3 and JOB_TITLE.search(org_lower):
+        return False
+    return True
+
+
+VALIDATORS = {
+    "PERSON": is_valid_person_name,
+    "ORG": is_valid_organization,
+}
+
+
+def validate_batch(spans, stoplists=DEFAULT_STOPLISTS) -> list:
+    """
+    Keep the PERSON / ORG spans (anything with .label_ and .text, e.g. doc.ents)
+    that pass validation. Repeated mentions reuse the first decision.
+    """
+    decisions = {}
+    kept = []
+    for span in spans:
+        check = VALIDATORS.get(span.label_)
+        if check is None:
+            continue
+        key = (span.label_, span.text.strip())
+        ok = decisions.get(key)
+        if ok is None:
+            ok = decisions[key] = check(key[1], stoplists)
+        if ok:
+            kept.append(span)
+    return kept
@@ -0,0 +1,105 @@
+"""
+Directory watching for incremental extraction.
+
+changed_files() yields the files already in a directory, then every file
+that is created or rewritten afterwards.  On Linux it uses inotify (through
+ctypes, no extra dependency) and reports a file once its writer closes it
+or it is moved into place; elsewhere, or with poll_interval set, it falls
+back to polling and reports a file once its size and mtime have held still
+for one interval, so half-written files are not picked up.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class Inotify:
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+
+    def read(self, timeout: float) -> list[str]:
+        """Names of files finished or moved in within `timeout` seconds."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        names, pos = [], 0
+        while pos < len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, pos)
+            pos += EVENT_HEADER.size
+            names.append(os.fsdecode(data[pos:pos + length].rstrip(b"\0")))
+            pos += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _snapshot(directory: str, suffix: str) -> dict[str, tuple[int, int]]:
+    snap = {}
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(suffix) and entry.is_file():
+                st = entry.stat()
+                snap[entry.path] = (st.st_size, st.st_mtime_ns)
+    return snap
+
+
+def changed_files(directory: str, suffix: str = ".txt", poll_interval: float | None = None):
+    """Yield existing files in sorted order, then new or rewritten ones as they settle."""
+    # Watch before listing, so files written while the existing ones are
+    # consumed (the caller may block for a long time) are still reported
+    watcher = None
+    if poll_interval is None:
+        try:
+            watcher = Inotify(directory)
+        except (OSError, AttributeError):
+            # No inotify on this platform (AttributeError: symbol missing from libc)
+            poll_interval = 1.0
+
+    seen = _snapshot(directory, suffix)
+    yield from sorted(seen)
+
+    if watcher:
+        try:
+            while True:
+                for name in watcher.read(1.0):
+                    if not name.endswith(suffix):
+                        continue
+                    path = os.path.join(directory, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    # Events queued for files already listed above are skipped
+                    sig = (st.st_size, st.st_mtime_ns)
+                    if seen.get(path) != sig:
+                        seen[path] = sig
+                        yield path
+        finally:
+            watcher.close()
+
+    last = dict(seen)
+    while True:
+        time.sleep(poll_interval)
+        current = _snapshot(directory, suffix)
+        for path, sig in sorted(current.items()):
+            if last.get(path) == sig and seen.get(path) != sig:
+                seen[path] = sig
+                yield path
+        last = current
@@ -4,210 +4,675 @@ Enhanced entity & context extraction from a directory of .txt files,
 outputting both terminal summary + a CSV of every lead with context.
 
 Usage:
-    python extract_leads_with_context.py [INPUT_DIR]
+    python extract_leads_with_context.py [INPUT_DIR] [--workers N] [--batch-size N]
+                                         [--cache PATH | --no-cache] [--all-mentions]
+                                         [--stoplist FILE] [--mode full|contacts|tiered]
+                                         [--model sm|md|lg|distilled|NAME] [--report-startup]
+                                         [--dedupe] [--index FILE] [--chunk-size N]
+                                         [--metrics [FILE]] [--slowest N] [--profile FILE]
+                                         [--near-dup [THRESHOLD]] [--skip-near-dup]
+                                         [--shard I/N] [--watch [--poll SECONDS] [--queue-size N]]
+                                         [--format csv|jsonl|parquet] [--run-id ID]
+                                         [--pool] [--prune-vectors N]
+                                         [--input-format txt|leads|raw] [--gate]
+    python extract_leads_with_context.py merge [SHARD_DIR] [--dedupe] [--index FILE]
+                                               [--format csv|jsonl|parquet] [--run-id ID]
 
 If INPUT_DIR is not provided, defaults to "./deepscrape".
+
+Inputs: by default INPUT_DIR holds clean.js's cleaned .txt files.  With
+--input-format leads it is main.js's detailed_leads/ (*.json), with raw the
+scraper's deepscrape/ pages (*.txt, *.html); both are cleaned in-process
+with clean.js's patterns and every record gets source_url and platform
+columns.
+
+Modes:
+    full      spaCy NER plus URL/email/phone extraction on every file (default)
+    contacts  URLs, emails and phones only; spaCy is never imported
+    tiered    contacts everywhere, NER only on files with people signals
+              (emails, founder/CEO titles, LinkedIn profile URLs)
+
+With --gate, each file is first screened with cheap heuristics (length,
+character classes, English stopword rate, link density; see
+extractor/gate.py): empty and binary-looking files are skipped; short,
+digit-heavy, non-English, non-Latin and link-list pages get contacts-only
+extraction, and only the rest go on to NER as the mode says.  The route each file
+actually took (ner, contacts or skip), the gate's verdict and its features
+are recorded per file in --metrics.  Files served from cache, near-duplicates
+and files over --chunk-size are not gated.
+
+Results are cached per file content in a SQLite database, so re-runs only
+process new or modified files and an interrupted run resumes where it stopped.
+
+With --near-dup, files whose text is a near-duplicate (MinHash estimated
+Jaccard similarity >= THRESHOLD, default 0.9) of an earlier file are not
+sent through NER: they reuse that file's records (tagged with duplicate_of)
+or, with --skip-near-dup, produce none.  The mapping is written to
+near_duplicates.csv.
+
+Workers: --workers N runs N spaCy processes through nlp.pipe.  With --pool
+the model is instead loaded once, frozen with gc.freeze() and shared
+copy-on-write by N forked workers, and per-worker RSS/PSS is reported at
+the end.  --prune-vectors N shrinks the model's static vectors to N rows
+(smaller footprint, slight accuracy cost); --model sm/md trades accuracy
+for memory further.  --model distilled uses the small CPU-fast NER model
+that distill.py trains from this script's own output (models/leads_ner).
+
+Output: leads_with_context.csv by default.  With --format jsonl or parquet
+(parquet needs pyarrow) records are written in buffered batches to
+leads_with_context/{jsonl,parquet}/run=RUN_ID/part-NNNNN.*, one directory per
+run (RUN_ID defaults to a timestamp); Parquet dictionary-encodes the file
+and type columns.  Shard and watch outputs are always CSV.
+
+Watch mode: `--watch` processes the files already in INPUT_DIR, then keeps
+running and extracts every .txt file that appears or is rewritten (inotify
+on Linux, polling elsewhere or with --poll) using a model loaded once.
+Files wait in a bounded queue, so a fast producer blocks instead of piling
+up memory.  Records are appended to leads_with_context.csv one file at a
+time with a single flushed write; a rewritten file's rows are replaced by
+atomically swapping in a new CSV.  Stop with Ctrl-C.
+
+Sharding: `--shard I/N` processes only the files whose name hashes
+(crc32) to shard I of N and writes leads_with_context.shard-I-of-N.csv plus
+a .json summary once the shard completes.  `merge` checks that all N shards
+finished and streams their CSVs, already sorted by file, into one
+leads_with_context.csv (optionally --dedupe'd) identical to a single-node
+run.  Files reported by more than one shard are kept from the lowest shard.
+Near-duplicate detection only looks within a shard.
+
+With --metrics, per-file and per-stage wall/CPU timings, entity counts and
+file sizes are written as JSON lines (one per file, then a run summary
+with the slowest files) and a timing breakdown is printed.  --profile
+additionally runs the whole extraction under cProfile.
+
+The extraction logic itself lives in the importable `extractor` package.
 """
 
 import os
-import re
+import time
+import sys
 import glob
 import csv
+import json
+import heapq
+import io
+import queue
+import threading
+import zlib
 import argparse
+import cProfile
+import functools
+import pstats
 from collections import Counter
-from urllib.parse import urlparse
-
-try:
-    import spacy
-except ImportError:
-    raise ImportError("Please install spaCy: pip install spacy")
-
-try:
-    import phonenumbers
-except ImportError:
-    raise ImportError("Please install python-phonenumbers: pip install phonenumbers")
+from contextlib import nullcontext
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_lg")
-except OSError:
-    raise OSError("Please download the spaCy model: python -m spacy download en_core_web_lg")
+_t0 = time.perf_counter()
+from extractor import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_MODEL, EXTRACTOR_VERSION, LOAD_TIMES, MIN_CHUNK_SIZE, MODEL_SIZES, MODES,
+    extract, extract_chunked, extract_many, load_model, model_name,
+)
+from extractor.cache import ResultCache, file_digest
+from extractor.dedup import DEFAULT_THRESHOLD, NearDuplicateIndex
+from extractor.index import EntityIndex
+from extractor.metrics import Metrics, timed
+from extractor.model import model_id, prune_vectors as shrink_vectors
+from extractor.output import FORMATS, open_output
+from extractor.pool import ForkPool
+from extractor.sources import INPUT_FORMATS, SOURCE_FIELDS, list_documents, read_document
+from extractor.watch import changed_files
+from extractor.validators import DEFAULT_STOPLISTS, load_stoplists
+IMPORT_TIME = time.perf_counter() - _t0
 
-# Disable unused components for speed
-for pipe in ["tagger", "parser", "attribute_ruler", "lemmatizer"]:
-    if pipe in nlp.pipe_names:
-        nlp.disable_pipe(pipe)
+RECORD_FIELDS = ["file", "type", "entity", "snippet"]
+DEDUPE_FIELDS = ["type", "entity", "key", "mentions", "files", "snippet"]
+NEAR_DUP_FIELDS = ["file", "duplicate_of", "similarity"]
+SHARD_PATTERN = "leads_with_context.shard-*-of-*"
 
 # -------------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------------
 
-def context_snippet(text: str, term: str, window: int = 80) -> str:
-    lc = text.lower()
-    idx = lc.find(term.lower())
-    if idx < 0:
-        return ""
-    start = max(0, idx - window)
-    end   = min(len(text), idx + len(term) + window)
-    snippet = text[start:end].strip()
-    # Trim to sentence boundary if possible
-    parts = re.split(r'(?<=[\.\?\!])\s+', snippet)
-    return parts[-1].replace("\n", " ")
-
-def is_valid_person_name(name: str) -> bool:
-    name = name.strip()
-    if not (2 <= len(name) <= 50): return False
-    if not re.search(r"[A-Za-z]", name): return False
-    if sum(c.isdigit() for c in name) > 0.3 * len(name): return False
-    if name.isupper() and len(name) > 4: return False
-    if any(tok in name.lower() for tok in ("http", "@", ".com")): return False
-    if name.lower() in {"linkedin","twitter","facebook","google","amazon"}:
-        return False
-    return True
-
-def is_valid_organization(org: str) -> bool:
-    org = org.strip()
-    if not (2 <= len(org) <= 100): return False
-    if not re.search(r"[A-Za-z]", org): return False
-    if sum(c.isdigit() for c in org) > 0.5 * len(org): return False
-    if any(tok in org.lower() for tok in ("http", "@", "example.com")): return False
-    return True
-
-def clean_url(url: str) -> str|None:
-    url = url.strip().rstrip('.,;!?')
+def read_text(path: str) -> str:
+    with timed("read"), open(path, encoding="utf8", errors="ignore") as fh:
+        return fh.read()
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """'I/N' -> (I, N) with 0 <= I < N."""
     try:
-        p = urlparse(url)
-        if not (p.scheme and p.netloc):
-            return None
-    except:
-        return None
-    if any(domain in url.lower() for domain in ("example.com","localhost")):
-        return None
-    return url
-
-def extract_phone_numbers(text: str) -> list[str]:
-    patterns = [
-        r'\+\d{1,3}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}',
-        r'\(\d{3}\)[-.\s]?\d{3}[-.\s]?\d{4}',
-        r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
-        r'\+91[-.\s]?\d{10}',
-        r'\b\d{10}\b',
-    ]
-    found = set()
-    for pat in patterns:
-        for match in re.findall(pat, text):
-            digits = re.findall(r'\d', match)
-            if not (7 <= len(digits) <= 15):
-                continue
-            for region in ("US","IN","GB","CA","AU"):
-                try:
-                    num = phonenumbers.parse(match, region)
-                    if phonenumbers.is_valid_number(num):
-                        formatted = phonenumbers.format_number(
-                            num, phonenumbers.PhoneNumberFormat.INTERNATIONAL
-                        )
-                        found.add(formatted)
-                        break
-                except:
-                    pass
-    return sorted(found)
-
-def extract_entities_with_context(text: str, filename: str) -> list[dict]:
-    records = []
-    doc = nlp(text)
-
-    # PERSON & ORG
-    for ent in doc.ents:
-        t = ent.text.strip()
-        if ent.label_ == "PERSON" and is_valid_person_name(t):
-            records.append({
-                "file": filename,
-                "type": "person",
-                "entity": t,
-                "snippet": context_snippet(text, t)
-            })
-        elif ent.label_ == "ORG" and is_valid_organization(t):
-            records.append({
-                "file": filename,
-                "type": "organization",
-                "entity": t,
-                "snippet": context_snippet(text, t)
-            })
-
-    # URLs
-    for url in set(re.findall(r'https?://[^\s<>"\[\]{}|\\^`]+', text)):
-        clean = clean_url(url)
-        if clean:
-            records.append({
-                "file": filename,
-                "type": "url",
-                "entity": clean,
-                "snippet": context_snippet(text, clean)
-            })
-
-    # Emails
-    for email in set(re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b', text)):
-        if not any(fake in email.lower() for fake in ("example","test","fake")):
-            records.append({
-                "file": filename,
-                "type": "email",
-                "entity": email,
-                "snippet": context_snippet(text, email)
-            })
-
-    # Phones
-    for phone in extract_phone_numbers(text):
-        records.append({
-            "file": filename,
-            "type": "phone",
-            "entity": phone,
-            "snippet": context_snippet(text, phone)
-        })
-
-    return records
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got {spec!r}")
+    if not 0 <= i < n:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..{n - 1}")
+    return i, n
+
+def shard_of(filename: str, shards: int) -> int:
+    """Stable shard for a file name, identical on every machine and run."""
+    return zlib.crc32(filename.encode("utf8")) % shards
+
+def with_suffix(path: str, suffix: str) -> str:
+    root, ext = os.path.splitext(path)
+    return root + suffix + ext
+
+@functools.cache
+def resolve_stoplists(stoplist_path: str | None):
+    # One Stoplists object per path: pipelines are cached per Stoplists instance
+    return load_stoplists(stoplist_path) if stoplist_path else DEFAULT_STOPLISTS
+
+def cache_version(all_mentions: bool, mode: str, stoplist_path: str | None, gate: bool = False):
+    """Cache version string for these options, and the stoplists to use."""
+    version = EXTRACTOR_VERSION + ("+mentions" if all_mentions else "")
+    if mode != "full":
+        version += "+" + mode
+    if gate:
+        version += "+gate"
+    stoplists = resolve_stoplists(stoplist_path)
+    if stoplist_path:
+        # Custom stoplists change the output, so they are part of the cache key
+        version += "+" + stoplists.digest[:12]
+    return version, stoplists
+
+def print_summary(out_path: str, summary_counter: Counter, index: EntityIndex | None, dedupe: bool):
+    if dedupe:
+        print(f"→ Written {len(index.entries)} distinct entities "
+              f"({sum(summary_counter.values())} mentions) to {out_path}")
+    else:
+        print(f"→ Written {sum(summary_counter.values())} total records to {out_path}")
+    print("→ Breakdown by type:")
+    for t, cnt in summary_counter.items():
+        distinct = f" ({index.count(t)} distinct)" if index is not None else ""
+        print(f"   - {t:12}: {cnt}{distinct}")
 
 # -------------------------------------------------------------------
 # Main processing
 # -------------------------------------------------------------------
-def process_all(input_dir: str):
-    txt_files = glob.glob(os.path.join(input_dir, "*.txt"))
+def process_all(input_dir: str, workers: int = 1, batch_size: int = 16,
+                cache_path: str | None = ".leads_cache.sqlite", all_mentions: bool = False,
+                stoplist_path: str | None = None, mode: str = "full", model: str = DEFAULT_MODEL,
+                dedupe: bool = False, index_path: str | None = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, metrics_path: str | None = None,
+                slowest: int = 10, near_dup: float | None = None, skip_near_dup: bool = False,
+                shard: tuple[int, int] | None = None, output_format: str = "csv",
+                run_id: str | None = None, pool: bool = False, prune_vectors: int | None = None,
+                input_format: str = "txt", gate: bool = False):
+    txt_files = list_documents(input_dir, input_format)
     if not txt_files:
-        print(f"No .txt files found in '{input_dir}'.")
+        print(f"No {input_format} input files found in '{input_dir}'.")
         return
 
-    csv_path = "leads_with_context.csv"
+    # Every output of a shard run carries the shard in its name so N
+    # processes can share a working directory
+    suffix = ""
+    if shard:
+        i, n = shard
+        total = len(txt_files)
+        txt_files = [path for path in txt_files if shard_of(os.path.basename(path), n) == i]
+        suffix = f".shard-{i}-of-{n}"
+        print(f"Shard {i}/{n}: {len(txt_files)} of {total} files.")
+    if metrics_path:
+        metrics_path = with_suffix(metrics_path, suffix)
     summary_counter = Counter()
 
-    with open(csv_path, "w", newline="", encoding="utf8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=["file","type","entity","snippet"])
-        writer.writeheader()
+    version, stoplists = cache_version(all_mentions, mode, stoplist_path, gate)
+    if input_format != "txt":
+        version += "+" + input_format
+    if prune_vectors and mode != "contacts":
+        shrink_vectors(load_model(model, stoplists=stoplists), prune_vectors)
+        version += f"+pv{prune_vectors}"
+    cache = ResultCache(cache_path, model_id(model), version) if cache_path else None
+    digests = {path: file_digest(path) for path in txt_files} if cache else {}
+    cached = {}
+    if cache:
+        for path in txt_files:
+            recs = cache.get(digests[path], os.path.basename(path))
+            if recs is not None:
+                cached[path] = recs
+        print(f"{len(cached)} of {len(txt_files)} files served from cache.")
+
+    # Only uncached files are extracted; results come back in input order.
+    # Files bigger than one chunk are streamed through extract_chunked instead
+    # of being read whole, so memory stays bounded by the chunk size.
+    # leads/raw inputs need cleaning first, so they are always read whole.
+    large = {path for path in txt_files if path not in cached and os.path.getsize(path) > chunk_size
+             and input_format == "txt"}
+
+    # Source metadata (URL, platform) of leads/raw inputs, filled in as files are read
+    sources = {}
+
+    def load(path):
+        with timed("read"):
+            text, sources[path] = read_document(path, input_format)
+        return text
 
+    def with_source(path, recs):
+        return [dict(r, **sources[path]) for r in recs] if sources.get(path) else recs
+
+    # Near-duplicates of an earlier file reuse (or skip) its results instead of
+    # going through NER again. Files over the chunk size are not fingerprinted.
+    duplicates = {}
+    if near_dup is not None:
+        near = NearDuplicateIndex(near_dup)
         for path in txt_files:
-            fname = os.path.basename(path)
-            print(f"Processing {fname}…")
-            text = open(path, encoding="utf8", errors="ignore").read()
-            recs = extract_entities_with_context(text, fname)
+            if os.path.getsize(path) > chunk_size:
+                continue
+            with timed("dedup"):
+                match = near.match_or_add(path, load(path))
+            if match and path not in cached:
+                duplicates[path] = match
+        print(f"{len(duplicates)} near-duplicate files will {'be skipped' if skip_near_dup else 'reuse results'}.")
+    originals = {original for original, _ in duplicates.values()}
+    reusable = {}
+
+    pending = [path for path in txt_files
+               if path not in cached and path not in large and path not in duplicates]
+    texts = ((load(path), os.path.basename(path)) for path in pending)
+    # Gate decisions by file name, filled in as the extractor screens each file
+    decisions = {}
+    routes = Counter()
+    if pool:
+        pool = ForkPool(workers, mode=mode, model=model, batch_size=batch_size,
+                        all_mentions=all_mentions, stoplists=stoplists, gate=gate)
+        fresh = pool.extract(texts, decisions)
+    else:
+        fresh = extract_many(texts, mode=mode, model=model, batch_size=batch_size,
+                             n_process=workers, all_mentions=all_mentions, stoplists=stoplists,
+                             gate=gate, decisions=decisions)
+
+    # With dedupe, rows are folded into the index and written once at the end
+    index = EntityIndex() if dedupe or index_path else None
 
+    metrics = Metrics(metrics_path, slowest) if metrics_path else None
+
+    fields = DEDUPE_FIELDS if dedupe else (
+        RECORD_FIELDS
+        + (SOURCE_FIELDS if input_format != "txt" else [])
+        + (["duplicate_of"] if near_dup is not None else [])
+    )
+
+    with open_output(output_format, fields, f"leads_with_context{suffix}", run_id) as out, \
+            metrics or nullcontext():
+
+        for path in txt_files:
+            if metrics:
+                original = duplicates.get(path, (None,))[0]
+                metrics.begin_doc(os.path.basename(path), os.path.getsize(path), cached=path in cached,
+                                  duplicate_of=original and os.path.basename(original))
+            if path in cached:
+                recs = cached.pop(path)
+            elif path in duplicates:
+                fname = os.path.basename(path)
+                original = os.path.basename(duplicates[path][0])
+                recs = [] if skip_near_dup else [
+                    dict(r, file=fname, duplicate_of=original, **sources.get(path, {}))
+                    for r in reusable[duplicates[path][0]]
+                ]
+                print(f"Processed {fname} (near-duplicate of {original})…")
+            elif path in large:
+                fname = os.path.basename(path)
+                recs = extract_chunked(path, fname, mode=mode, model=model, all_mentions=all_mentions,
+                                       stoplists=stoplists, chunk_size=chunk_size)
+                print(f"Processed {fname} in chunks…")
+                if cache:
+                    with timed("cache"):
+                        cache.put(digests[path], recs)
+            else:
+                fname, recs = next(fresh)
+                recs = with_source(path, recs)
+                decision = decisions.pop(fname, None)
+                if decision:
+                    route = decision.pop("route")
+                    routes[route] += 1
+                    if metrics:
+                        metrics.annotate(route=route, gate=decision)
+                    print(f"Processed {fname} ({route}: {decision['reason']})…")
+                else:
+                    print(f"Processed {fname}…")
+                if cache:
+                    with timed("cache"):
+                        cache.put(digests[path], recs)
+            with timed("write"):
+                if index is not None:
+                    index.add_records(recs)
+                if not dedupe:
+                    out.write(recs)
             for r in recs:
-                writer.writerow(r)
                 summary_counter[r["type"]] += 1
+            if path in originals and not skip_near_dup:
+                reusable[path] = recs
+            if metrics:
+                metrics.end_doc(recs)
+
+        if dedupe:
+            with timed("write"):
+                out.write(index.rows())
+
+    if cache:
+        cache.close()
+    if pool:
+        pool.close()
+    if index_path:
+        index.save(index_path)
+    if near_dup is not None:
+        with open(f"near_duplicates{suffix}.csv", "w", newline="", encoding="utf8") as fh:
+            dup_writer = csv.DictWriter(fh, fieldnames=NEAR_DUP_FIELDS)
+            dup_writer.writeheader()
+            dup_writer.writerows(
+                {"file": os.path.basename(path), "duplicate_of": os.path.basename(original),
+                 "similarity": f"{sim:.3f}"}
+                for path, (original, sim) in duplicates.items()
+            )
+
+    if shard:
+        # Written last: its presence tells merge that the shard completed
+        with open(f"leads_with_context{suffix}.json", "w", encoding="utf8") as fh:
+            json.dump({"shard": shard[0], "shards": shard[1],
+                       "files": [os.path.basename(path) for path in txt_files],
+                       "counts": summary_counter}, fh, indent=2)
 
     print("\nExtraction complete.")
-    print(f"→ Written {sum(summary_counter.values())} total records to {csv_path}")
-    print("→ Breakdown by type:")
-    for t, cnt in summary_counter.items():
-        print(f"   - {t:12}: {cnt}")
+    print_summary(out.path, summary_counter, index, dedupe)
+    if gate:
+        print(f"→ Gate: {routes['ner']} NER, {routes['contacts']} contacts-only, {routes['skip']} skipped")
+        ungated = len(txt_files) - sum(routes.values())
+        if ungated:
+            print(f"   ({ungated} files served from cache, near-duplicate or chunked were not gated)")
+    if near_dup is not None:
+        print(f"→ {len(duplicates)} near-duplicate files mapped in near_duplicates{suffix}.csv")
+    if pool:
+        print("→ Memory per process (MB; PSS splits shared pages, so it sums to the real total):")
+        for pid, mem in pool.memory.items():
+            print(f"   - {pid!s:8}: RSS {mem['rss_mb']}  PSS {mem['pss_mb']}  private {mem['private_mb']}")
+    if metrics:
+        metrics.print_summary()
+        print(f"→ Metrics written to {metrics_path}")
+
+# -------------------------------------------------------------------
+# Watch mode
+# -------------------------------------------------------------------
+class IncrementalCSV:
+    """
+    CSV of per-file records that grows as files are processed.  New files
+    are appended with one flushed write each, so readers never see half a
+    file's rows; a file processed again is replaced by rewriting the CSV to
+    a temporary file and renaming it over the old one.
+    """
+
+    def __init__(self, path: str, fields: list[str]):
+        self.path = path
+        self.fields = fields
+        self.rows = {}
+        self._rewrite()
+
+    def _render(self, records: list[dict], header: bool = False) -> str:
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=self.fields)
+        if header:
+            writer.writeheader()
+        writer.writerows(records)
+        return buf.getvalue()
+
+    def _rewrite(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf8") as fh:
+            fh.write(self._render([r for recs in self.rows.values() for r in recs], header=True))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+
+    def update(self, filename: str, records: list[dict]):
+        if filename in self.rows:
+            self.rows[filename] = records
+            self._rewrite()
+            return
+        self.rows[filename] = records
+        with open(self.path, "a", newline="", encoding="utf8") as fh:
+            fh.write(self._render(records))
+            fh.flush()
+            os.fsync(fh.fileno())
+
+def watch(input_dir: str, cache_path: str | None = ".leads_cache.sqlite", all_mentions: bool = False,
+          stoplist_path: str | None = None, mode: str = "full", model: str = DEFAULT_MODEL,
+          chunk_size: int = DEFAULT_CHUNK_SIZE, poll_interval: float | None = None,
+          queue_size: int = 256, gate: bool = False):
+    """Extract files as they appear in input_dir until interrupted."""
+    version, stoplists = cache_version(all_mentions, mode, stoplist_path, gate)
+    cache = ResultCache(cache_path, model_id(model), version) if cache_path else None
+    if mode != "contacts":
+        load_model(model, stoplists=stoplists)  # warm before the first file arrives
+
+    work = queue.Queue(maxsize=queue_size)
+
+    def feed():
+        for path in changed_files(input_dir, poll_interval=poll_interval):
+            work.put(path)  # blocks while the queue is full
+
+    threading.Thread(target=feed, daemon=True).start()
+
+    csv_path = "leads_with_context.csv"
+    out = IncrementalCSV(csv_path, RECORD_FIELDS)
+    processed = {}  # path -> digest of the content last extracted
+    print(f"Watching '{input_dir}' for .txt files (Ctrl-C to stop)…")
+    try:
+        while True:
+            path = work.get()
+            try:
+                digest = file_digest(path)
+            except FileNotFoundError:
+                continue
+            if processed.get(path) == digest:
+                continue
+            fname = os.path.basename(path)
+            t0 = time.perf_counter()
+            recs = cache.get(digest, fname) if cache else None
+            if recs is None:
+                if os.path.getsize(path) > chunk_size:
+                    recs = extract_chunked(path, fname, mode=mode, model=model, all_mentions=all_mentions,
+                                           stoplists=stoplists, chunk_size=chunk_size)
+                else:
+                    recs = extract(read_text(path), fname, mode=mode, model=model,
+                                   all_mentions=all_mentions, stoplists=stoplists, gate=gate)
+                if cache:
+                    cache.put(digest, recs)
+            out.update(fname, recs)
+            processed[path] = digest
+            print(f"Processed {fname}: {len(recs)} records in {time.perf_counter() - t0:.2f}s "
+                  f"({work.qsize()} queued)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cache:
+            cache.close()
+
+    print(f"\nStopped watching after {len(processed)} files.")
+    print_summary(csv_path, Counter(r["type"] for recs in out.rows.values() for r in recs), None, False)
+
+def merge_shards(shard_dir: str = ".", dedupe: bool = False, index_path: str | None = None,
+                 output_format: str = "csv", run_id: str | None = None):
+    """Combine completed shard outputs into one leads_with_context output."""
+    summaries = {}
+    for path in glob.glob(os.path.join(shard_dir, SHARD_PATTERN + ".json")):
+        with open(path, encoding="utf8") as fh:
+            summary = json.load(fh)
+        summaries[summary["shard"], summary["shards"]] = path
+    counts = {n for _, n in summaries}
+    if len(counts) != 1:
+        sys.exit(f"Error: expected shard summaries for exactly one N in '{shard_dir}', found {sorted(counts)}.")
+    n = counts.pop()
+    missing = [i for i in range(n) if (i, n) not in summaries]
+    if missing:
+        sys.exit(f"Error: shards {missing} of {n} have not completed.")
+
+    csv_paths = [os.path.join(shard_dir, f"leads_with_context.shard-{i}-of-{n}.csv") for i in range(n)]
+    handles = [open(path, newline="", encoding="utf8") for path in csv_paths]
+    readers = [csv.DictReader(fh) for fh in handles]
+    fields = readers[0].fieldnames
+    if any(r.fieldnames != fields for r in readers):
+        sys.exit("Error: shard CSVs were written with different options.")
+
+    def tagged(reader, i):
+        for row in reader:
+            yield row["file"], i, row
+
+    # Each shard CSV is sorted by file, so a k-way merge reproduces the
+    # single-node order without loading everything into memory
+    summary_counter = Counter()
+    index = EntityIndex() if dedupe or index_path else None
+    owner = {}
+    with open_output(output_format, DEDUPE_FIELDS if dedupe else fields, "leads_with_context", run_id) as out:
+        for fname, i, row in heapq.merge(*(tagged(r, i) for i, r in enumerate(readers)),
+                                         key=lambda t: t[0]):
+            if owner.setdefault(fname, i) != i:
+                continue
+            if index is not None:
+                index.add_records([row])
+            if not dedupe:
+                out.write([row])
+            summary_counter[row["type"]] += 1
+        if dedupe:
+            out.write(index.rows())
+    for fh in handles:
+        fh.close()
+    if index_path:
+        index.save(index_path)
+
+    print(f"Merged {n} shards covering {len(owner)} files with records.")
+    print_summary(out.path, summary_counter, index, dedupe)
+
+def report_startup(mode: str, model: str, stoplists=DEFAULT_STOPLISTS):
+    print(f"Startup: imported extractor in {IMPORT_TIME:.3f}s")
+    if mode == "contacts":
+        print("Startup: contacts mode, no spaCy model loaded")
+        return
+    load_model(model, stoplists=stoplists)
+    print(f"Startup: imported spaCy in {LOAD_TIMES['import_spacy']:.3f}s")
+    print(f"Startup: loaded {model_name(model)} in {LOAD_TIMES[model_name(model)]:.3f}s")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "merge":
+        m = argparse.ArgumentParser(prog="extract_leads_with_context.py merge",
+                                    description="Merge --shard outputs into leads_with_context.csv")
+        m.add_argument("shard_dir", nargs="?", default=".",
+                       help="Directory holding the shard CSV/JSON outputs")
+        m.add_argument("--dedupe", action="store_true",
+                       help="Write one row per normalized entity with mention counts and files")
+        m.add_argument("--index",
+                       help="Also save the cross-file entity index as JSON to this path")
+        m.add_argument("--format", choices=FORMATS, default="csv",
+                       help="Output format; jsonl/parquet are partitioned per run")
+        m.add_argument("--run-id",
+                       help="Partition name for jsonl/parquet output (default: timestamp)")
+        margs = m.parse_args(sys.argv[2:])
+        merge_shards(margs.shard_dir, dedupe=margs.dedupe, index_path=margs.index,
+                     output_format=margs.format, run_id=margs.run_id)
+        sys.exit(0)
+
     p = argparse.ArgumentParser(
         description="Extract leads + context from .txt files"
     )
     p.add_argument("input_dir", nargs="?", default="../cleaned_data",
                    help="Directory containing your .txt files")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Number of spaCy worker processes (nlp.pipe n_process)")
+    p.add_argument("--input-format", choices=INPUT_FORMATS, default="txt",
+                   help="txt: cleaned .txt files; leads: detailed_leads/*.json; raw: deepscrape pages")
+    p.add_argument("--pool", action="store_true",
+                   help="Share one loaded model with --workers forked processes (copy-on-write)")
+    p.add_argument("--prune-vectors", type=int, metavar="N",
+                   help="Keep only the N most frequent static vectors to cut model memory")
+    p.add_argument("--batch-size", type=int, default=16,
+                   help="Documents per nlp.pipe batch")
+    p.add_argument("--cache", default=".leads_cache.sqlite",
+                   help="SQLite file used to cache per-file results")
+    p.add_argument("--no-cache", action="store_true",
+                   help="Re-process every file and skip the result cache")
+    p.add_argument("--all-mentions", action="store_true",
+                   help="Emit a record (and snippet) for every URL/email/phone mention")
+    p.add_argument("--mode", choices=MODES, default="full",
+                   help="full: NER + contacts; contacts: regex only, no spaCy; "
+                        "tiered: NER only where people signals are found")
+    p.add_argument("--gate", action="store_true",
+                   help="Screen files with cheap heuristics first: skip empty/binary ones and "
+                        "extract only contacts from non-English or link-list pages")
+    p.add_argument("--model", default=DEFAULT_MODEL,
+                   help=f"spaCy model size ({'/'.join(MODEL_SIZES)}) or package name/path")
+    p.add_argument("--report-startup", action="store_true",
+                   help="Load the model up front and print cold-start timings")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                   help="Files larger than this are processed in overlapping chunks of this many characters")
+    p.add_argument("--dedupe", action="store_true",
+                   help="Write one row per normalized entity with mention counts and files")
+    p.add_argument("--index",
+                   help="Also save the cross-file entity index as JSON to this path")
+    p.add_argument("--stoplist",
+                   help="JSON/YAML file or directory of .txt lists with extra person/organization/"
+                        "business_terms stopwords and companies/platforms gazetteers")
+    p.add_argument("--near-dup", type=float, nargs="?", const=DEFAULT_THRESHOLD,
+                   help=f"Reuse results for near-duplicate files at this similarity (default {DEFAULT_THRESHOLD})")
+    p.add_argument("--skip-near-dup", action="store_true",
+                   help="With --near-dup, emit no records for near-duplicate files")
+    p.add_argument("--shard", type=parse_shard,
+                   help="Process only shard I of N (e.g. 0/4); combine the outputs with `merge`")
+    p.add_argument("--watch", action="store_true",
+                   help="Keep running and extract new or rewritten files as they appear")
+    p.add_argument("--poll", type=float,
+                   help="With --watch, poll every SECONDS instead of using inotify")
+    p.add_argument("--queue-size", type=int, default=256,
+                   help="With --watch, maximum number of files waiting to be processed")
+    p.add_argument("--format", choices=FORMATS, default="csv",
+                   help="Output format; jsonl/parquet are partitioned per run")
+    p.add_argument("--run-id",
+                   help="Partition name for jsonl/parquet output (default: timestamp)")
+    p.add_argument("--metrics", nargs="?", const="leads_metrics.jsonl",
+                   help="Write per-file/per-stage timings as JSON lines (default: leads_metrics.jsonl)")
+    p.add_argument("--slowest", type=int, default=10,
+                   help="Number of slowest files listed in the metrics summary")
+    p.add_argument("--profile",
+                   help="Run under cProfile and dump stats to this path")
     args = p.parse_args()
 
     if not os.path.isdir(args.input_dir):
         print(f"Error: '{args.input_dir}' is not a directory.")
         exit(1)
 
-    process_all(args.input_dir)
+    if args.chunk_size < MIN_CHUNK_SIZE:
+        p.error(f"--chunk-size must be at least {MIN_CHUNK_SIZE}")
+
+    if args.shard and (args.dedupe or args.index):
+        p.error("--dedupe and --index apply to the merged output; pass them to `merge`")
+
+    if args.watch and (args.dedupe or args.index or args.shard or args.near_dup is not None):
+        p.error("--watch cannot be combined with --dedupe, --index, --shard or --near-dup")
+
+    if args.watch and args.input_format != "txt":
+        p.error("--watch reads cleaned .txt files only")
+    if (args.shard or args.watch) and args.format != "csv":
+        p.error("--shard and --watch write CSV; use --format with `merge` or a batch run")
+
+    if args.report_startup:
+        _, stoplists = cache_version(args.all_mentions, args.mode, args.stoplist)
+        report_startup(args.mode, args.model, stoplists)
+
+    if args.watch:
+        watch(args.input_dir, cache_path=None if args.no_cache else args.cache,
+              all_mentions=args.all_mentions, stoplist_path=args.stoplist, mode=args.mode, model=args.model,
+              chunk_size=args.chunk_size, poll_interval=args.poll, queue_size=args.queue_size,
+              gate=args.gate)
+        sys.exit(0)
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    process_all(args.input_dir, workers=args.workers, batch_size=args.batch_size,
+                cache_path=None if args.no_cache else args.cache,
+                all_mentions=args.all_mentions, stoplist_path=args.stoplist, mode=args.mode, model=args.model,
+                dedupe=args.dedupe, index_path=args.index, chunk_size=args.chunk_size,
+                metrics_path=args.metrics, slowest=args.slowest,
+                near_dup=args.near_dup, skip_near_dup=args.skip_near_dup, shard=args.shard,
+                output_format=args.format, run_id=args.run_id,
+                pool=args.pool, prune_vectors=args.prune_vectors, input_format=args.input_format,
+                gate=args.gate)
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"\n→ Profile written to {args.profile}; top functions by cumulative time:")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
@@ -0,0 +1,25 @@
+import pytest
+
+from extractor import extract, extract_chunked
+
+TEXT = "\n\n".join(
+    (f"Section {i}. Write to team{i}@brightline.io or call +1 415-555-{1000 + i}. "
+     f"Docs live at https://brightline.io/page/{i} for now. ") * 3
+    for i in range(200)
+)
+
+
+def ordered(records):
+    # Chunks emit records chunk by chunk, so only the order may differ
+    return sorted(records, key=lambda record: tuple(record.values()))
+
+
+@pytest.mark.parametrize("all_mentions", [False, True])
+@pytest.mark.parametrize("chunk_size", [1_000, 4_096, 8_000, 20_000])
+def test_chunked_matches_whole_file(tmp_path, chunk_size, all_mentions):
+    path = tmp_path / "big.txt"
+    path.write_text(TEXT, encoding="utf8")
+    expected = extract(TEXT, "big.txt", mode="contacts", all_mentions=all_mentions)
+    chunked = extract_chunked(str(path), "big.txt", mode="contacts", all_mentions=all_mentions,
+                              chunk_size=chunk_size)
+    assert ordered(chunked) == ordered(expected)
@@ -0,0 +1,51 @@
+import random
+
+from extractor.dedup import NearDuplicateIndex, shingles, signature, similarity
+
+WORDS = [f"w{i}" for i in range(5000)]
+
+
+def page(rng, n=1500):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def jaccard(a, b):
+    x, y = shingles(a), shingles(b)
+    return len(x & y) / len(x | y)
+
+
+def test_permutations_are_distinct():
+    sig = signature(page(random.Random(1)))
+    assert len(set(sig)) > 1
+
+
+def test_one_word_edit_is_a_near_duplicate():
+    rng = random.Random(2)
+    text = page(rng)
+    words = text.split()
+    words[len(words) // 2] = "edited"
+    edited = " ".join(words)
+    assert jaccard(text, edited) > 0.99
+    assert similarity(signature(text), signature(edited)) >= 0.9
+
+    index = NearDuplicateIndex()
+    assert index.match_or_add("a", text) is None
+    assert index.match_or_add("b", edited)[0] == "a"
+
+
+def test_unrelated_pages_are_not_duplicates():
+    rng = random.Random(3)
+    index = NearDuplicateIndex()
+    for i in range(50):
+        assert index.match_or_add(str(i), page(rng, 300)) is None
+
+
+def test_partial_overlap_is_not_flagged():
+    rng = random.Random(4)
+    flagged = 0
+    for _ in range(100):
+        shared, a, b = page(rng, 200), page(rng, 200), page(rng, 200)
+        # ~1/3 of each page's shingles are shared
+        x, y = f"{shared} {a}", f"{shared} {b}"
+        flagged += similarity(signature(x), signature(y)) >= 0.9
+    assert flagged == 0
@@ -0,0 +1,23 @@
+from extractor import extract
+from extractor.gate import classify
+
+DIRECTORY = "\n".join(f"Dr Li +1 415-555-{1200 + i} ext {i}" for i in range(30))
+
+
+def test_digit_heavy_directory_keeps_its_contacts():
+    assert classify(DIRECTORY)[0] == "contacts"
+    expected = extract(DIRECTORY, mode="contacts")
+    assert len(expected) == 30
+    assert extract(DIRECTORY, mode="contacts", gate=True) == expected
+
+
+def test_short_snippet_keeps_its_email():
+    text = "Reach sarah@brightline.io now"
+    assert classify(text)[0] == "contacts"
+    records = extract(text, mode="contacts", gate=True)
+    assert [r["entity"] for r in records] == ["sarah@brightline.io"]
+
+
+def test_only_empty_and_binary_text_is_skipped():
+    assert classify("   \n ")[0] == "skip"
+    assert classify("\x00\x01binary\x02" * 20)[0] == "skip"
@@ -0,0 +1,27 @@
+import spacy
+
+from extractor.gazetteer import add_gazetteer
+
+ORGS = ["Medium Rare Capital", "Slack Technologies", "Reddit Inc", "Indeed Jobs", "GitHub"]
+
+
+def make_nlp():
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns([{"label": "ORG", "pattern": org} for org in ORGS])
+    return add_gazetteer(nlp)
+
+
+def test_platform_names_inside_longer_orgs_are_kept():
+    doc = make_nlp()("We met Medium Rare Capital, Slack Technologies, Reddit Inc and Indeed Jobs.")
+    assert [(e.text, e.label_) for e in doc.ents] == [
+        ("Medium Rare Capital", "ORG"),
+        ("Slack Technologies", "ORG"),
+        ("Reddit Inc", "ORG"),
+        ("Indeed Jobs", "ORG"),
+    ]
+
+
+def test_bare_platform_is_relabelled():
+    doc = make_nlp()("Find us on GitHub or on Slack.")
+    assert [(e.text, e.label_) for e in doc.ents] == [("GitHub", "PLATFORM")]
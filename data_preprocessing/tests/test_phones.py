@@ -0,0 +1,24 @@
+import pytest
+
+from extractor.phones import extract_phone_numbers, find_phone_numbers
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Call +1 800 555 0199 24 hours a day", "+1 800-555-0199"),
+    ("Support: +44 20 7946 0958 1 min wait", "+44 20 7946 0958"),
+    ("Tel +1 212 555 0143 2 lines", "+1 212-555-0143"),
+    ("Call (415) 555-2671 today", "+1 415-555-2671"),
+    ("Email or call +1 415-555-2671.", "+1 415-555-2671"),
+])
+def test_trailing_digits_do_not_hide_the_number(text, expected):
+    assert extract_phone_numbers(text) == [expected]
+
+
+def test_span_covers_only_the_valid_number():
+    text = "Call +1 800 555 0199 24 hours a day"
+    [(_, start, end)] = find_phone_numbers(text)
+    assert text[start:end] == "+1 800 555 0199"
+
+
+def test_non_numbers_are_ignored():
+    assert extract_phone_numbers("Order 12345 shipped in 2 days") == []
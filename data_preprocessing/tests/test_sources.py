@@ -0,0 +1,23 @@
+import pytest
+
+from extractor.sources import clean_text, read_document
+
+
+# Expected values are clean.js's cleanData() output under node
+@pytest.mark.parametrize("raw, cleaned", [
+    ("project size min budget Müller GmbH Location Berlin is big",
+     "project size üller GmbH Berlin is big"),
+    ("RevRatingsiews left RatReviewsings here", "Reviews left here"),
+    ("URL: https://a.com\r\nPLATFORM: clutch\nAcme Contact us at 01-02-2024 Xavier café max 50 ñandú ok",
+     "Acme us at avier café ñandú ok"),
+])
+def test_clean_text_matches_clean_js(raw, cleaned):
+    assert clean_text(raw) == cleaned
+
+
+@pytest.mark.parametrize("data", ['{"source": {"url": ', '["not", "a", "lead"]'])
+def test_malformed_lead_is_reported(tmp_path, capsys, data):
+    path = tmp_path / "lead.json"
+    path.write_text(data, encoding="utf8")
+    assert read_document(str(path), "leads") == ("", {"source_url": "", "platform": ""})
+    assert f"Error reading {path}" in capsys.readouterr().out
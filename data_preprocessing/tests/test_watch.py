@@ -0,0 +1,18 @@
+import sys
+
+import pytest
+
+from extractor.watch import changed_files
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_files_written_during_backlog_are_reported(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.txt").write_text("b")
+    files = changed_files(str(tmp_path))
+    assert next(files) == str(tmp_path / "a.txt")
+
+    # Written while the caller is still working through the existing files
+    (tmp_path / "c.txt").write_text("c")
+    assert next(files) == str(tmp_path / "b.txt")
+    assert next(files) == str(tmp_path / "c.txt")
@@ -14,6 +14,8 @@ class SmartLeadGenerator {
     this.maxTabs = 2;
     this.resultsDir = path.join(__dirname, 'leads');
     this.deepDir = path.join(__dirname, 'detailed_leads');
+    // Optional local extraction service (data_preprocessing/extractor/service.py)
+    this.extractorUrl = process.env.EXTRACTOR_URL || null;
     this.pageQueue = [];
     
     if (!fs.existsSync(this.resultsDir)) fs.mkdirSync(this.resultsDir);
@@ -478,6 +480,27 @@ Return only valid JSON.`
     }
   }
 
+  async extractEntities(scrapedData, url) {
+    if (!this.extractorUrl || !scrapedData) return null;
+
+    try {
+      const response = await fetch(`${this.extractorUrl}/extract`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ documents: [{ id: url, url, ...scrapedData }] })
+      });
+      if (!response.ok) {
+        console.error(`Entity extraction failed for ${url}: HTTP ${response.status}`);
+        return null;
+      }
+      const { results } = await response.json();
+      return results[0]?.records || [];
+    } catch (error) {
+      console.error(`Entity extraction failed for ${url}:`, error.message);
+      return null;
+    }
+  }
+
   async extractLeadInfo(scrapedData, url, userInput, pageIndex) {
     if (!scrapedData) return null;
 
@@ -657,7 +680,10 @@ Return only valid JSON.`
       try {
         const scrapedData = await this.deepScrape(originalResult.url, pageIndex);
         if (scrapedData) {
+          // Entity extraction runs on the warm service while the LLM qualifies the lead
+          const entitiesPromise = this.extractEntities(scrapedData, originalResult.url);
           const leadInfo = await this.extractLeadInfo(scrapedData, originalResult.url, userInput, pageIndex);
+          const entities = await entitiesPromise;
           if (leadInfo) {
             const leadFileName = `lead_${Date.now()}_${Math.random().toString(36).substr(2, 9)}_${leadInfo.company?.replace(/[^a-zA-Z0-9]/g, '_') || 'unknown'}.json`;
             fs.writeFileSync(
@@ -666,6 +692,7 @@ Return only valid JSON.`
                 source: originalResult,
                 leadInfo,
                 scrapedData,
+                entities,
                 score: result.score,
                 reason: result.reason
               }, null, 2)